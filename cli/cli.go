@@ -1,7 +1,9 @@
 package cli
 
 import (
+	"bufio"
 	"bytes"
+	"errors"
 	"fmt"
 	"os"
 	"os/exec"
@@ -166,24 +168,33 @@ var renderCommand = &cli.Command{
 		}
 
 		// Get the renders for the apps and ensure that they are OK.
-		renders, err := core.GetRenders(cfg, appNames, flags.SrcNames.Value(), srcTypes, flags.Debug, flags.DryRun)
+		renders, err := core.GetRenders(cfg, appNames, flags.SrcNames.Value(), srcTypes, flags.Debug, flags.DryRun, true)
 		exitOnError(err, -1)
 
 		// If dry-run is enabled, just print the command lines to stdout and return.
+		// Releases rendered together from the same Helmfile share a command line, so only print each once.
 		if flags.DryRun {
+			printed := make(map[string]bool)
 			for _, render := range renders {
-				if render.CmdLine != "" { // Skip static manifests as they aren't rendered with a command line.
+				if render.CmdLine != "" && !printed[render.CmdLine] { // Skip static manifests as they aren't rendered with a command line.
 					fmt.Println(render.CmdLine)
+					printed[render.CmdLine] = true
 				}
 			}
 			return nil
 		}
 
-		// Otherwise, print the rendered manifests to stdout and return.
+		// Otherwise, stream the rendered manifests to stdout and return.
 		manifests := core.GetManifests(renders)
+		stdout := bufio.NewWriter(os.Stdout)
 		for _, manifest := range manifests {
-			fmt.Println(manifest.Doc())
+			_, err := manifest.WriteTo(stdout)
+			exitOnError(err, -1)
+			_, err = fmt.Fprintln(stdout)
+			exitOnError(err, -1)
 		}
+		err = stdout.Flush()
+		exitOnError(err, -1)
 		return nil
 	},
 }
@@ -221,29 +232,42 @@ var writeCommand = &cli.Command{
 			exitOnError(err, -1)
 		}
 
-		// Get the renders for the apps and ensure that they are OK.
 		// Unlike the 'render' command, we won't allow dry-run here as we want to
 		// update the rendered manifests in the output directory.
-		renders, err := core.GetRenders(cfg, appNames, flags.SrcNames.Value(), srcTypes, flags.Debug, flags.DryRun)
-		exitOnError(err, -1)
-
-		// Clean output directories if the clean flag is set.
-		if flags.Clean {
-			for _, appName := range appNames {
-				appDir := path.Join(flags.OutputDir, appName)
-				printMsg(fmt.Sprintf("Cleaning up %s\n", appDir), true)
-				if err := os.RemoveAll(appDir); err != nil {
-					exitOnError(err, -1)
-				}
+		writeManifest := func(manifest *core.Manifest) error {
+			path, written, err := manifest.Write(flags.OutputDir)
+			if err != nil {
+				return err
+			}
+			if written {
+				printMsg(fmt.Sprintf("Wrote %s\n", path), false)
+			} else {
+				printMsg(fmt.Sprintf("Unchanged %s\n", path), true)
 			}
+			return nil
 		}
 
-		// Write the rendered manifests to the output directory.
-		manifests := core.GetManifests(renders)
-		for _, manifest := range manifests {
-			path, err := manifest.Write(flags.OutputDir)
+		// Without the clean flag, write the rendered manifests to the output directory as soon as they are rendered.
+		if !flags.Clean {
+			err = core.StreamManifests(cfg, appNames, flags.SrcNames.Value(), srcTypes, flags.Debug, flags.DryRun, true, writeManifest)
+			exitOnError(err, -1)
+			return nil
+		}
+
+		// With the clean flag, get all the renders for the apps and ensure that they are OK
+		// before cleaning output directories, so that a failed render leaves them untouched.
+		renders, err := core.GetRenders(cfg, appNames, flags.SrcNames.Value(), srcTypes, flags.Debug, flags.DryRun, true)
+		exitOnError(err, -1)
+		for _, appName := range appNames {
+			appDir := path.Join(flags.OutputDir, appName)
+			printMsg(fmt.Sprintf("Cleaning up %s\n", appDir), true)
+			if err := os.RemoveAll(appDir); err != nil {
+				exitOnError(err, -1)
+			}
+		}
+		for _, manifest := range core.GetManifests(renders) {
+			err := writeManifest(manifest)
 			exitOnError(err, -1)
-			printMsg(fmt.Sprintf("Wrote %s\n", path), false)
 		}
 		return nil
 	},
@@ -271,40 +295,47 @@ var checkCommand = &cli.Command{
 			exitOnError(err, -1)
 		}
 
-		// Get the renders for the apps and ensure that they are OK.
-		// Unlike the 'render' command, we won't allow dry-run here as we want to
-		// update the rendered manifests in the output directory.
-		renders, err := core.GetRenders(cfg, appNames, nil, core.ValidSrcTypes, flags.Debug, flags.DryRun)
-		exitOnError(err, -1)
-
 		// Ensure that we're starting with a clean temp directory.
 		tempDir, err := os.MkdirTemp("", "manifestus")
 		exitOnError(err, -1)
 
-		// Ensure thaw we're cleaning up the temp directory when we're done.
-		defer func(path string) {
+		// Ensure that we're cleaning up the temp directory when we're done.
+		// It is also cleaned up explicitly before exiting, as os.Exit doesn't run deferred functions.
+		cleanUp := func() {
 			if flags.Verbose {
-				printMsg(fmt.Sprintf("Cleaning up manifest output directory: %s\n", path), true)
+				printMsg(fmt.Sprintf("Cleaning up manifest output directory: %s\n", tempDir), true)
 			}
-			err := os.RemoveAll(path)
+			err := os.RemoveAll(tempDir)
 			exitOnError(err, -1)
-		}(tempDir)
+		}
+		defer cleanUp()
 
-		// Write the rendered manifests to the output directory.
-		manifests := core.GetManifests(renders)
-		for _, manifest := range manifests {
+		// Write the rendered manifests to the temp directory as soon as they are rendered.
+		// Unlike the 'render' command, we won't allow dry-run here as we want to
+		// compare the rendered manifests with those in the output directory.
+		// The render cache is bypassed, so that stale cached renders can't hide changes.
+		err = core.StreamManifests(cfg, appNames, nil, core.ValidSrcTypes, flags.Debug, flags.DryRun, false, func(manifest *core.Manifest) error {
 			printMsg(fmt.Sprintf("Writing %s", manifest.AppName), true)
-			_, err := manifest.Write(tempDir)
-			exitOnError(err, -1)
+			_, _, err := manifest.Write(tempDir)
+			return err
+		})
+		if err != nil {
+			cleanUp()
 		}
+		exitOnError(err, -1)
 
 		// Test if the contents of the output dir and the temp dir are the same.
 		diff, err := diffDirs(flags.OutputDir, tempDir)
+		if err != nil {
+			cleanUp()
+		}
 		exitOnError(err, -1)
 
 		// If there are differences, show them and exit with a non-zero exit code to indicate differences found.
 		if len(diff) > 0 {
+			printMsg(diff, false)
 			printMsg("Rendered manifests are not up-to-date with their sources", false)
+			cleanUp()
 			os.Exit(1)
 		}
 		printMsg("Rendered manifests are up-to-date with their sources", false)
@@ -421,14 +452,20 @@ var outdatedFlag = cli.BoolFlag{
 }
 
 // diffDirs runs the `diff` command to compare the contents of two directories.
+// Only the files that differ are reported, as computing the differences in their contents isn't needed.
 // An empty string is returned if the directories are the same.
 // An error is returned if the `diff` command fails.
 func diffDirs(dir1, dir2 string) (string, error) {
-	cmd := exec.Command("diff", "-r", dir1, dir2)
+	cmd := exec.Command("diff", "-r", "-q", dir1, dir2)
 	var out bytes.Buffer
 	cmd.Stdout = &out
 	cmd.Stderr = &out
 	err := cmd.Run()
+	// The `diff` command exits with status code 1 when differences are found, which isn't a failure.
+	var exitErr *exec.ExitError
+	if errors.As(err, &exitErr) && exitErr.ExitCode() == 1 {
+		err = nil
+	}
 	return out.String(), err
 }
 
@@ -454,6 +491,16 @@ func printMsg(msg string, verboseOnly bool) {
 	exitOnError(err, -1)
 }
 
+// printWarning prints a warning message to stderr if the quiet flag is not set.
+// Warnings go to stderr so that they don't mix with manifests rendered to stdout.
+func printWarning(msg string) {
+	if flags.Quiet {
+		return
+	}
+	_, err := fmt.Fprintf(os.Stderr, "Warning: %s\n", strings.TrimSuffix(msg, "\n"))
+	exitOnError(err, -1)
+}
+
 // getAppNames returns the app names from the config file or the enabled apps if none are specified.
 func getAppNames(cfg *core.Config, appNames []string) ([]string, error) {
 	if len(appNames) == 0 {
@@ -462,6 +509,11 @@ func getAppNames(cfg *core.Config, appNames []string) ([]string, error) {
 		if err := core.EnsureAppNamesExist(cfg, appNames); err != nil {
 			return nil, err
 		}
+		for _, appName := range appNames {
+			if cfg.FindApp(appName).Disabled {
+				printWarning(fmt.Sprintf("Skipping disabled app %s", appName))
+			}
+		}
 	}
 	sort.Strings(appNames)
 	return appNames, nil
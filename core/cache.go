@@ -0,0 +1,179 @@
+package core
+
+import (
+	"crypto/sha256"
+	"encoding/hex"
+	"fmt"
+	"io/fs"
+	"os"
+	"os/exec"
+	"path/filepath"
+	"sort"
+	"strconv"
+	"strings"
+	"time"
+)
+
+const (
+	// cacheEnvVar is the environment variable used to disable the render cache when set to a false value like "0".
+	cacheEnvVar = "MANIFESTUS_CACHE"
+
+	// cacheDirEnvVar is the environment variable used to override the render cache directory.
+	cacheDirEnvVar = "MANIFESTUS_CACHE_DIR"
+
+	// cacheMaxAge is how long renders are kept in the cache without being used.
+	cacheMaxAge = 30 * 24 * time.Hour
+)
+
+// cacheDir returns the directory of the render cache, or an empty string if the cache is disabled.
+// The cache is stored in the 'manifestus' directory of the user cache directory, which is
+// '$XDG_CACHE_HOME' or '~/.cache' on Linux, unless overridden by the MANIFESTUS_CACHE_DIR env var.
+func cacheDir() string {
+	if value, ok := os.LookupEnv(cacheEnvVar); ok {
+		if enabled, err := strconv.ParseBool(value); err == nil && !enabled {
+			return ""
+		}
+	}
+	if dir := os.Getenv(cacheDirEnvVar); dir != "" {
+		return dir
+	}
+	dir, err := os.UserCacheDir()
+	if err != nil {
+		return ""
+	}
+	return filepath.Join(dir, "manifestus")
+}
+
+// getCacheKey returns the cache key of a render command and its args executed in a working dir
+// from the file or directory tree inputs it reads. Files are identified by their path,
+// size, and modification time rather than their contents to keep fingerprinting cheap.
+// The key also covers everything else known to change the output of the render commands:
+// the current working directory relative paths in args are resolved against, the command
+// executable identified like input files, and the 'HELM_*' and 'HELMFILE_*' environment
+// variables, which select the Helmfile environment and configure 'helm'.
+func getCacheKey(args []string, workingDir string, inputs []string) (string, error) {
+	cwd, err := os.Getwd()
+	if err != nil {
+		return "", err
+	}
+	cmdPath, err := lookPath(args[0])
+	if err != nil {
+		return "", err
+	}
+	cmdInfo, err := os.Stat(cmdPath)
+	if err != nil {
+		return "", err
+	}
+	hash := sha256.New()
+	_, _ = fmt.Fprintf(hash, "%s\x00%s\x00%s\x00%s\x00", Version, strings.Join(args, "\x00"), cwd, workingDir)
+	_, _ = fmt.Fprintf(hash, "%s\x00%d\x00%d\x00", cmdPath, cmdInfo.Size(), cmdInfo.ModTime().UnixNano())
+	env := make([]string, 0)
+	for _, variable := range os.Environ() {
+		if strings.HasPrefix(variable, "HELM_") || strings.HasPrefix(variable, "HELMFILE_") {
+			env = append(env, variable)
+		}
+	}
+	sort.Strings(env)
+	_, _ = fmt.Fprintf(hash, "%s\x00", strings.Join(env, "\x00"))
+	for _, input := range inputs {
+		err := filepath.WalkDir(input, func(p string, d fs.DirEntry, err error) error {
+			if err != nil {
+				return err
+			}
+			if d.IsDir() {
+				// Skip hidden directories like '.git' which never hold render inputs.
+				if p != input && strings.HasPrefix(d.Name(), ".") {
+					return filepath.SkipDir
+				}
+				return nil
+			}
+			info, err := d.Info()
+			if err != nil {
+				return err
+			}
+			_, err = fmt.Fprintf(hash, "%s\x00%d\x00%d\x00", p, info.Size(), info.ModTime().UnixNano())
+			return err
+		})
+		if err != nil {
+			return "", err
+		}
+	}
+	return hex.EncodeToString(hash.Sum(nil)), nil
+}
+
+// readCache returns the cached render output for a key, if any.
+// The modification time of a cached render is updated when read, so that pruneCache only removes unused renders.
+func readCache(dir, key string) ([]byte, bool) {
+	p := filepath.Join(dir, key)
+	data, err := os.ReadFile(p)
+	if err != nil {
+		return nil, false
+	}
+	now := time.Now()
+	_ = os.Chtimes(p, now, now)
+	return data, true
+}
+
+// pruneCache removes renders not used for longer than cacheMaxAge from the cache, including temp files left behind
+// by interrupted writes, as renders for previous versions of inputs are never used again once the inputs change.
+// The cache is best effort, so failing to prune it is ignored.
+func pruneCache(dir string) {
+	entries, err := os.ReadDir(dir)
+	if err != nil {
+		return
+	}
+	cutoff := time.Now().Add(-cacheMaxAge)
+	for _, entry := range entries {
+		if entry.IsDir() {
+			continue
+		}
+		info, err := entry.Info()
+		if err != nil || info.ModTime().After(cutoff) {
+			continue
+		}
+		_ = os.Remove(filepath.Join(dir, entry.Name()))
+	}
+}
+
+// writeCache atomically writes render output for a key to the cache.
+func writeCache(dir, key string, data []byte) error {
+	if err := os.MkdirAll(dir, 0755); err != nil {
+		return err
+	}
+	file, err := os.CreateTemp(dir, key+".*.tmp")
+	if err != nil {
+		return err
+	}
+	if _, err := file.Write(data); err != nil {
+		_ = file.Close()
+		_ = os.Remove(file.Name())
+		return err
+	}
+	if err := file.Close(); err != nil {
+		_ = os.Remove(file.Name())
+		return err
+	}
+	return os.Rename(file.Name(), filepath.Join(dir, key))
+}
+
+// execCachedCmd executes a render command like execCmd, unless its output for the same inputs is cached in dir.
+// On a cache hit, no command is executed and a nil command is returned. Only successful output is cached.
+// Rendering proceeds uncached if dir is empty or any of the inputs cannot be fingerprinted.
+func execCachedCmd(dir string, args []string, workingDir string, inputs []string) (*exec.Cmd, []byte, []byte, int, error) {
+	if dir == "" {
+		return execCmd(args, workingDir)
+	}
+	key, err := getCacheKey(args, workingDir, inputs)
+	if err != nil {
+		return execCmd(args, workingDir)
+	}
+	if data, ok := readCache(dir, key); ok {
+		return nil, data, nil, 0, nil
+	}
+	cmd, stdout, stderr, exitCode, err := execCmd(args, workingDir)
+	if err == nil && exitCode == 0 {
+		// The cache is best effort, so failing to write it doesn't fail the render.
+		_ = writeCache(dir, key, stdout)
+	}
+	return cmd, stdout, stderr, exitCode, err
+}
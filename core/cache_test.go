@@ -0,0 +1,146 @@
+package core
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+)
+
+func Test_getCacheKey(t *testing.T) {
+	dir := t.TempDir()
+	input := filepath.Join(dir, "values.yaml")
+	if err := os.WriteFile(input, []byte("a: 1\n"), 0644); err != nil {
+		t.Fatal(err)
+	}
+	key, err := getCacheKey([]string{"sh", "-c", "echo foo"}, "", []string{dir})
+	if err != nil {
+		t.Fatalf("getCacheKey() error = %v", err)
+	}
+
+	tests := []struct {
+		name     string
+		args     []string
+		modify   func(t *testing.T)
+		wantSame bool
+	}{
+		{
+			name:     "should return same key for unchanged inputs",
+			args:     []string{"sh", "-c", "echo foo"},
+			modify:   func(t *testing.T) {},
+			wantSame: true,
+		},
+		{
+			name:     "should return different key for different command args",
+			args:     []string{"sh", "-c", "echo bar"},
+			modify:   func(t *testing.T) {},
+			wantSame: false,
+		},
+		{
+			name: "should return different key for different Helmfile environment",
+			args: []string{"sh", "-c", "echo foo"},
+			modify: func(t *testing.T) {
+				t.Setenv("HELMFILE_ENVIRONMENT", "production")
+			},
+			wantSame: false,
+		},
+		{
+			name:     "should return same key for unrelated environment variables",
+			args:     []string{"sh", "-c", "echo foo"},
+			modify:   func(t *testing.T) { t.Setenv("MANIFESTUS_TEST", "1") },
+			wantSame: true,
+		},
+		{
+			name: "should return different key for different working directory",
+			args: []string{"sh", "-c", "echo foo"},
+			modify: func(t *testing.T) {
+				cwd, err := os.Getwd()
+				if err != nil {
+					t.Fatal(err)
+				}
+				if err := os.Chdir(dir); err != nil {
+					t.Fatal(err)
+				}
+				t.Cleanup(func() {
+					_ = os.Chdir(cwd)
+				})
+			},
+			wantSame: false,
+		},
+		{
+			name: "should return different key for changed inputs",
+			args: []string{"sh", "-c", "echo foo"},
+			modify: func(t *testing.T) {
+				if err := os.WriteFile(input, []byte("a: 22\n"), 0644); err != nil {
+					t.Fatal(err)
+				}
+			},
+			wantSame: false,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			tt.modify(t)
+			got, err := getCacheKey(tt.args, "", []string{dir})
+			if err != nil {
+				t.Fatalf("getCacheKey() error = %v", err)
+			}
+			if (got == key) != tt.wantSame {
+				t.Errorf("getCacheKey() got = %v, key = %v, wantSame %v", got, key, tt.wantSame)
+			}
+		})
+	}
+}
+
+func Test_cacheDir(t *testing.T) {
+	tests := []struct {
+		name     string
+		cache    string
+		cacheDir string
+		want     string
+	}{
+		{
+			name:     "should return overridden cache dir",
+			cache:    "1",
+			cacheDir: "/tmp/manifestus-cache",
+			want:     "/tmp/manifestus-cache",
+		},
+		{
+			name:     "should return empty dir if cache disabled",
+			cache:    "0",
+			cacheDir: "/tmp/manifestus-cache",
+			want:     "",
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			t.Setenv(cacheEnvVar, tt.cache)
+			t.Setenv(cacheDirEnvVar, tt.cacheDir)
+			if got := cacheDir(); got != tt.want {
+				t.Errorf("cacheDir() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func Test_pruneCache(t *testing.T) {
+	dir := t.TempDir()
+	old := time.Now().Add(-cacheMaxAge - time.Hour)
+	for name, modTime := range map[string]time.Time{"used": time.Now(), "unused": old, "unused.123.tmp": old} {
+		p := filepath.Join(dir, name)
+		if err := os.WriteFile(p, []byte("kind: A\n"), 0644); err != nil {
+			t.Fatal(err)
+		}
+		if err := os.Chtimes(p, modTime, modTime); err != nil {
+			t.Fatal(err)
+		}
+	}
+	pruneCache(dir)
+	entries, err := os.ReadDir(dir)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(entries) != 1 || entries[0].Name() != "used" {
+		t.Errorf("pruneCache() kept %v, want [used]", entries)
+	}
+}
@@ -9,11 +9,6 @@ import (
 	"gopkg.in/yaml.v3"
 )
 
-// configDir is the directory where the config was loaded from.
-// It is used to resolve relative paths in the config, output files, and the
-// Helmfile used by the 'helmfile template' command to render Helm releases.
-var configDir string
-
 // LoadConfig loads a YAML config file from the given path into a Config struct and returns it.
 func LoadConfig(filePath string) (*Config, error) {
 	file, err := os.Open(filePath)
@@ -27,9 +22,6 @@ func LoadConfig(filePath string) (*Config, error) {
 		}
 	}(file)
 
-	// Cache the directory of the config file for resolving relative paths used elsewhere.
-	configDir = filepath.Dir(filePath)
-
 	// Decode the YAML config file into a Config and return it.
 	decoder := yaml.NewDecoder(file)
 	config := Config{}
@@ -46,15 +38,24 @@ type Config struct {
 	Renderfile Renderfile `yaml:"renderfile"`
 }
 
+// Dir returns the directory where the config was loaded from.
+// It is used to resolve relative paths in the config, output files, and the
+// Helmfile used by the 'helmfile template' command to render Helm releases.
+func (c *Config) Dir() string {
+	return filepath.Dir(c.Path)
+}
+
 // EnabledApps returns the App objects in the config not disabled sorted by
 // name for consistent ordering of output and processing.
+// The returned Apps point into the Config rather than being copied.
 func (c *Config) EnabledApps() []*App {
-	enabled := make([]*App, 0)
-	for _, app := range c.Renderfile.Apps {
+	enabled := make([]*App, 0, len(c.Renderfile.Apps))
+	for i := range c.Renderfile.Apps {
+		app := &c.Renderfile.Apps[i]
 		if app.Disabled {
 			continue
 		}
-		enabled = append(enabled, &app)
+		enabled = append(enabled, app)
 	}
 	sort.Slice(enabled, func(i, j int) bool {
 		return enabled[i].Name < enabled[j].Name
@@ -74,10 +75,11 @@ func (c *Config) EnabledAppNames() []string {
 }
 
 // FindApp returns the enabled app in the config with the given name.
+// The returned App points into the Config rather than being copied.
 func (c *Config) FindApp(appName string) *App {
-	for _, app := range c.Renderfile.Apps {
-		if app.Name == appName {
-			return &app
+	for i := range c.Renderfile.Apps {
+		if c.Renderfile.Apps[i].Name == appName {
+			return &c.Renderfile.Apps[i]
 		}
 	}
 	return nil
@@ -154,32 +156,33 @@ type Bundle struct {
 
 // Paths returns filesystem paths in a bundle with {placeholders} replaced by values from the bundle's data.
 func (b Bundle) Paths() ([]string, error) {
-	paths := make([]string, 0)
-	for _, source := range b.Sources {
-		if isURL(source) {
-			continue
-		}
-		path, err := expandTemplate(source, b.Data)
-		if err != nil {
-			return nil, err
-		}
-		paths = append(paths, path)
-	}
-	return paths, nil
+	paths, _, err := b.expandSources()
+	return paths, err
 }
 
-// URLs returns filesystem paths in a bundle with {placeholders} replaced by values from the bundle's data.
+// URLs returns remote URLs in a bundle with {placeholders} replaced by values from the bundle's data.
 func (b Bundle) URLs() ([]string, error) {
-	urls := make([]string, 0)
+	_, urls, err := b.expandSources()
+	return urls, err
+}
+
+// expandSources returns the filesystem paths and remote URLs in a bundle with {placeholders} replaced
+// by values from the bundle's data in a single pass over its sources. Sources are classified as paths
+// or URLs after expansion, so that placeholders may expand to URLs.
+func (b Bundle) expandSources() ([]string, []string, error) {
+	expand := newTemplateExpander(b.Data)
+	paths := make([]string, 0, len(b.Sources))
+	urls := make([]string, 0, len(b.Sources))
 	for _, source := range b.Sources {
-		if !isURL(source) {
-			continue
-		}
-		url, err := expandTemplate(source, b.Data)
+		expanded, err := expand(source)
 		if err != nil {
-			return nil, err
+			return nil, nil, err
+		}
+		if isURL(expanded) {
+			urls = append(urls, expanded)
+		} else {
+			paths = append(paths, expanded)
 		}
-		urls = append(urls, url)
 	}
-	return urls, nil
+	return paths, urls, nil
 }
@@ -106,6 +106,22 @@ func TestBundle_URLs(t *testing.T) {
 				"https://github.com/cert-manager/cert-manager/releases/download/v1.16.2/cert-manager.crds.yaml",
 			},
 		},
+		{
+			name: "should return paths expanded to URLs",
+			fields: fields{
+				Name: "crds",
+				Data: map[string]string{
+					"base_url": "https://example.com/manifests",
+				},
+				Sources: []string{
+					"{base_url}/crds.yaml",
+					"local/crds.yaml",
+				},
+			},
+			want: []string{
+				"https://example.com/manifests/crds.yaml",
+			},
+		},
 	}
 	for _, tt := range tests {
 		t.Run(tt.name, func(t *testing.T) {
@@ -125,3 +141,37 @@ func TestBundle_URLs(t *testing.T) {
 		})
 	}
 }
+
+func TestConfig_FindApp(t *testing.T) {
+	cfg := Config{
+		Renderfile: Renderfile{
+			Apps: []App{
+				{Name: "cert-manager"},
+				{Name: "external-dns", Disabled: true},
+			},
+		},
+	}
+	tests := []struct {
+		name    string
+		appName string
+		want    *App
+	}{
+		{
+			name:    "should return app in config",
+			appName: "external-dns",
+			want:    &cfg.Renderfile.Apps[1],
+		},
+		{
+			name:    "should return nil if app not in config",
+			appName: "missing",
+			want:    nil,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := cfg.FindApp(tt.appName); got != tt.want {
+				t.Errorf("FindApp() = %p, want %p", got, tt.want)
+			}
+		})
+	}
+}
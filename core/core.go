@@ -1,9 +1,11 @@
 package core
 
 import (
+	"encoding/json"
 	"fmt"
-	"path"
+	"runtime"
 	"sort"
+	"sync"
 )
 
 // EnsureAppNamesExist checks if the given app names exist in the Config.
@@ -27,32 +29,35 @@ func EnsureSrcTypesValid(srcTypes []string) error {
 }
 
 // GetOutputFiles returns a list of output files of rendered manifests for named apps in the Config.
+// Disabled apps are skipped, as they are not rendered.
 func GetOutputFiles(cfg *Config, appNames, srcNames, srcTypes []string) []string {
-	paths := make([]string, 0)
+	srcNameSet := toSet(srcNames)
+	srcTypeSet := toSet(srcTypes)
+	paths := make([]string, 0, len(appNames))
 	for _, appName := range appNames {
 		app := cfg.FindApp(appName)
 		if app.Disabled {
 			continue
 		}
-		if contains(srcTypes, "release") {
+		if srcTypeSet["release"] {
 			for _, release := range app.Releases {
-				if len(srcNames) > 0 && !contains(srcNames, release.Name) {
+				if len(srcNameSet) > 0 && !srcNameSet[release.Name] {
 					continue
 				}
 				paths = append(paths, getOutputFilePath(app.Name, release.Name, "release"))
 			}
 		}
-		if contains(srcTypes, "kustomization") {
+		if srcTypeSet["kustomization"] {
 			for _, kustomization := range app.Kustomizations {
-				if len(srcNames) > 0 && !contains(srcNames, kustomization.Name) {
+				if len(srcNameSet) > 0 && !srcNameSet[kustomization.Name] {
 					continue
 				}
 				paths = append(paths, getOutputFilePath(app.Name, kustomization.Name, "kustomization"))
 			}
 		}
-		if contains(srcTypes, "bundle") {
+		if srcTypeSet["bundle"] {
 			for _, bundle := range app.Bundles {
-				if len(srcNames) > 0 && !contains(srcNames, bundle.Name) {
+				if len(srcNameSet) > 0 && !srcNameSet[bundle.Name] {
 					continue
 				}
 				paths = append(paths, getOutputFilePath(app.Name, bundle.Name, "bundle"))
@@ -63,39 +68,142 @@ func GetOutputFiles(cfg *Config, appNames, srcNames, srcTypes []string) []string
 }
 
 // GetRenders returns a list of rendered manifests for named apps in the Config.
-func GetRenders(cfg *Config, appNames, srcNames, srcTypes []string, debug, dryRun bool) ([]*Render, error) {
-	results := make([]*Render, 0)
-	for _, appName := range appNames {
-		app := cfg.FindApp(appName)
-		renders, err := getRendersForApp(app, srcNames, srcTypes, debug, dryRun)
-		if err != nil {
-			return nil, err
-		}
+// The sources of all apps are rendered concurrently, at most one per CPU at a
+// time, as the heavy lifting is done by external commands like 'helmfile' and
+// 'kustomize'. Releases of all apps from the same Helmfile are rendered together.
+// Disabled apps are skipped, even if named. Renders are cached if cache is true and the cache is enabled.
+func GetRenders(cfg *Config, appNames, srcNames, srcTypes []string, debug, dryRun, cache bool) (Renders, error) {
+	r := newRenderer(cfg, debug, dryRun, cache)
+	jobs := r.getRenderJobs(cfg, appNames, toSet(srcNames), toSet(srcTypes))
+	rendered, err := mapConcurrent(jobs, runtime.NumCPU(), func(job renderJob) (Renders, error) {
+		return job.render()
+	})
+	if err != nil {
+		return nil, err
+	}
+	results := make(Renders, 0, len(rendered))
+	for _, renders := range rendered {
 		results = append(results, renders...)
 	}
 	return results, nil
 }
 
+// StreamManifests renders manifests for named apps in the Config like GetRenders and GetManifests,
+// but calls fn with each manifest as soon as all its renders are done instead of returning them all.
+// Manifests aren't kept after fn returns, so only renders in flight are held in memory rather than all.
+// fn is called from the calling goroutine in the order manifests are done, which varies between runs.
+// Rendering stops at the first error returned by a render or fn, which is returned once jobs in flight are done.
+func StreamManifests(cfg *Config, appNames, srcNames, srcTypes []string, debug, dryRun, cache bool, fn func(*Manifest) error) error {
+	r := newRenderer(cfg, debug, dryRun, cache)
+	jobs := r.getRenderJobs(cfg, appNames, toSet(srcNames), toSet(srcTypes))
+
+	// Count the jobs rendering each manifest, as its renders are only done when all of them are.
+	pending := make(map[manifestKey]int)
+	for _, job := range jobs {
+		for _, key := range job.keys {
+			pending[key]++
+		}
+	}
+
+	// Run the jobs concurrently, sending their results in the order they are done.
+	type jobResult struct {
+		index   int
+		renders Renders
+		err     error
+	}
+	// On return, stop starting jobs and wait for those in flight to finish, which is when results is closed,
+	// so that no render commands or cache writes are left running after an early return on error.
+	results := make(chan jobResult)
+	done := make(chan struct{})
+	defer func() {
+		close(done)
+		for range results {
+		}
+	}()
+	go func() {
+		defer close(results)
+		sem := make(chan struct{}, runtime.NumCPU())
+		var wg sync.WaitGroup
+		for i, job := range jobs {
+			select {
+			case sem <- struct{}{}:
+			case <-done:
+				wg.Wait()
+				return
+			}
+			wg.Add(1)
+			go func(i int, job renderJob) {
+				defer wg.Done()
+				defer func() { <-sem }()
+				renders, err := job.render()
+				select {
+				case results <- jobResult{i, renders, err}:
+				case <-done:
+				}
+			}(i, job)
+		}
+		wg.Wait()
+	}()
+
+	// Collect renders of each manifest by job index, so that they are ordered as with GetManifests.
+	type jobRenders struct {
+		index   int
+		renders Renders
+	}
+	collected := make(map[manifestKey][]jobRenders)
+	for result := range results {
+		if result.err != nil {
+			return result.err
+		}
+		byKey := make(map[manifestKey]Renders)
+		for _, render := range result.renders {
+			key := manifestKey{render.AppName, render.SrcName, render.SrcType}
+			byKey[key] = append(byKey[key], render)
+		}
+		for _, key := range jobs[result.index].keys {
+			collected[key] = append(collected[key], jobRenders{result.index, byKey[key]})
+			pending[key]--
+			if pending[key] > 0 {
+				continue
+			}
+			parts := collected[key]
+			delete(collected, key)
+			sort.Slice(parts, func(i, j int) bool {
+				return parts[i].index < parts[j].index
+			})
+			renders := make(Renders, 0)
+			for _, part := range parts {
+				renders = append(renders, part.renders...)
+			}
+			if len(renders) == 0 {
+				continue
+			}
+			manifest := &Manifest{
+				AppName: key.appName,
+				SrcName: key.srcName,
+				SrcType: key.srcType,
+				Renders: renders,
+			}
+			if err := fn(manifest); err != nil {
+				return err
+			}
+		}
+	}
+	return nil
+}
+
 // GetManifests returns a list of manifests from a list of renders.
-func GetManifests(renders []*Render) []*Manifest {
+func GetManifests(renders Renders) []*Manifest {
 	// Map renders to manifests by app name, source name, and source type.
-	type descriptor struct {
-		appName string
-		srcName string
-		srcType string
-	}
-	seen := make(map[descriptor][]*Render)
+	seen := make(map[manifestKey]Renders)
 	for _, render := range renders {
-		key := descriptor{render.AppName, render.SrcName, render.SrcType}
-		if _, ok := seen[key]; !ok {
-			seen[key] = make([]*Render, 0)
-		}
+		key := manifestKey{render.AppName, render.SrcName, render.SrcType}
 		seen[key] = append(seen[key], render)
 	}
 
 	// Return manifests from the mapped renders.
-	manifestList := make([]*Manifest, 0)
-	keys := make([]descriptor, 0, len(seen))
+	manifestList := make([]*Manifest, 0, len(seen))
+	keys := make([]manifestKey, 0, len(seen))
 	for key := range seen {
 		keys = append(keys, key)
 	}
@@ -123,8 +231,9 @@ func GetManifests(renders []*Render) []*Manifest {
 }
 
 // getOutputFilePath returns the path of an output file of an app rendered manifest.
+// It is built by concatenation as it is called for every source, and app and source names never need cleaning.
 func getOutputFilePath(appName, srcName, srcType string) string {
-	return path.Join(appName, fmt.Sprintf("%s.%s.manifest.yaml", srcName, srcType))
+	return appName + "/" + srcName + "." + srcType + ".manifest.yaml"
 }
 
 // Chart represents metadata of a Helm chart defined in a Renderfile or Helmfile.
@@ -134,21 +243,41 @@ type Chart struct {
 	App     string
 }
 
+// helmSearchResult represents a chart in the JSON output of the 'helm search repo' command.
+type helmSearchResult struct {
+	Name    string `json:"name"`
+	Version string `json:"version"`
+}
+
 // LatestVersion returns the latest version of the Helm chart.
 func (c Chart) LatestVersion() (string, error) {
-	cmdline := fmt.Sprintf("helm search repo %s --max 1 | awk 'NR==2 {print $2}'", c.Name)
-	_, stdout, stderr, exit, err := execCmd(cmdline, "")
+	args := []string{"helm", "search", "repo", c.Name, "--output", "json"}
+	_, stdout, stderr, exit, err := execCmd(args, "")
 	if err != nil {
 		return string(stderr), err
 	}
 	if exit != 0 {
 		return string(stderr), fmt.Errorf("failed to get latest version for chart '%s'", c.Name)
 	}
-	return string(stdout), nil
+	results := make([]helmSearchResult, 0)
+	if err := json.Unmarshal(stdout, &results); err != nil {
+		return "", fmt.Errorf("failed to parse search results for chart '%s': %w", c.Name, err)
+	}
+	// Search results are matched by keyword, so prefer the chart with the exact name if found.
+	for _, result := range results {
+		if result.Name == c.Name {
+			return result.Version, nil
+		}
+	}
+	if len(results) == 0 {
+		return "", fmt.Errorf("chart '%s' not found", c.Name)
+	}
+	return results[0].Version, nil
 }
 
 func GetCharts(cfg *Config, appNames []string) ([]*Chart, error) {
 	results := make([]*Chart, 0)
+	helmfiles := make(map[string]*Helmfile)
 	for _, appName := range appNames {
 		app := cfg.FindApp(appName)
 		var chartInfo *Chart
@@ -160,7 +289,7 @@ func GetCharts(cfg *Config, appNames []string) ([]*Chart, error) {
 					App:     appName,
 				}
 			} else {
-				chart, version, err := getHelmfileHelmChartAndVersion(release.Helmfile, release.Name)
+				chart, version, err := getHelmfileHelmChartAndVersion(helmfiles, getReleaseHelmfile(cfg.Dir(), release), release.Name)
 				if err != nil {
 					return nil, err
 				}
@@ -178,8 +307,8 @@ func GetCharts(cfg *Config, appNames []string) ([]*Chart, error) {
 
 // ExecHelmRepoUpdate executes the 'helm repo update' command.
 func ExecHelmRepoUpdate() error {
-	cmdline := "helm repo update"
-	_, _, _, exit, err := execCmd(cmdline, "")
+	args := []string{"helm", "repo", "update"}
+	_, _, _, exit, err := execCmd(args, "")
 	if err != nil {
 		return fmt.Errorf("failed to update Helm repositories: error=%w", err)
 	}
@@ -1,7 +1,13 @@
 package core
 
 import (
+	"fmt"
+	"os"
 	"path"
+	"path/filepath"
+	"reflect"
+	"runtime"
+	"sort"
 	"testing"
 )
 
@@ -34,3 +40,252 @@ func Test_getOutputFilePath(t *testing.T) {
 		})
 	}
 }
+
+func TestGetManifests(t *testing.T) {
+	renders := Renders{
+		{AppName: "b", SrcName: "crds", SrcType: "bundle", Stdout: []byte("kind: A")},
+		{AppName: "a", SrcName: "app", SrcType: "release", Stdout: []byte("kind: B")},
+		{AppName: "b", SrcName: "crds", SrcType: "bundle", Stdout: []byte("kind: C")},
+	}
+	want := []*Manifest{
+		{AppName: "a", SrcName: "app", SrcType: "release", Renders: Renders{renders[1]}},
+		{AppName: "b", SrcName: "crds", SrcType: "bundle", Renders: Renders{renders[0], renders[2]}},
+	}
+	if got := GetManifests(renders); !reflect.DeepEqual(got, want) {
+		t.Errorf("GetManifests() = %v, want %v", got, want)
+	}
+}
+
+func TestGetOutputFiles(t *testing.T) {
+	cfg := &Config{
+		Renderfile: Renderfile{
+			Apps: []App{
+				{
+					Name:     "cert-manager",
+					Releases: []Release{{Name: "cert-manager"}},
+					Bundles:  []Bundle{{Name: "crds"}},
+				},
+				{
+					Name:     "external-dns",
+					Disabled: true,
+					Releases: []Release{{Name: "external-dns"}},
+				},
+			},
+		},
+	}
+	type args struct {
+		appNames []string
+		srcNames []string
+		srcTypes []string
+	}
+	tests := []struct {
+		name string
+		args args
+		want []string
+	}{
+		{
+			name: "should return output files of enabled apps",
+			args: args{
+				appNames: []string{"cert-manager", "external-dns"},
+				srcTypes: ValidSrcTypes,
+			},
+			want: []string{
+				"cert-manager/cert-manager.release.manifest.yaml",
+				"cert-manager/crds.bundle.manifest.yaml",
+			},
+		},
+		{
+			name: "should return output files of named sources",
+			args: args{
+				appNames: []string{"cert-manager"},
+				srcNames: []string{"crds"},
+				srcTypes: ValidSrcTypes,
+			},
+			want: []string{
+				"cert-manager/crds.bundle.manifest.yaml",
+			},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			got := GetOutputFiles(cfg, tt.args.appNames, tt.args.srcNames, tt.args.srcTypes)
+			if !reflect.DeepEqual(got, tt.want) {
+				t.Errorf("GetOutputFiles() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func TestGetRenders(t *testing.T) {
+	dir := t.TempDir()
+	if err := os.WriteFile(filepath.Join(dir, "crds.yaml"), []byte("kind: A\n"), 0644); err != nil {
+		t.Fatal(err)
+	}
+	cfg := &Config{
+		Path: filepath.Join(dir, "renderfile.yaml"),
+		Renderfile: Renderfile{
+			Apps: []App{
+				{
+					Name:    "cert-manager",
+					Bundles: []Bundle{{Name: "crds", Sources: []string{"crds.yaml"}}},
+				},
+				{
+					Name:     "external-dns",
+					Disabled: true,
+					Bundles:  []Bundle{{Name: "crds", Sources: []string{"crds.yaml"}}},
+				},
+			},
+		},
+	}
+	tests := []struct {
+		name     string
+		appNames []string
+		want     []string
+	}{
+		{
+			name:     "should render enabled apps",
+			appNames: []string{"cert-manager", "external-dns"},
+			want:     []string{"cert-manager"},
+		},
+		{
+			name:     "should skip disabled apps even if named",
+			appNames: []string{"external-dns"},
+			want:     []string{},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			renders, err := GetRenders(cfg, tt.appNames, nil, ValidSrcTypes, false, false, false)
+			if err != nil {
+				t.Fatalf("GetRenders() error = %v", err)
+			}
+			got := make([]string, 0, len(renders))
+			for _, render := range renders {
+				got = append(got, render.AppName)
+			}
+			if !reflect.DeepEqual(got, tt.want) {
+				t.Errorf("GetRenders() apps = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func TestStreamManifests(t *testing.T) {
+	dir := t.TempDir()
+	for name, data := range map[string]string{"a.yaml": "kind: A\n", "b.yaml": "kind: B\n"} {
+		if err := os.WriteFile(filepath.Join(dir, name), []byte(data), 0644); err != nil {
+			t.Fatal(err)
+		}
+	}
+	cfg := &Config{
+		Path: filepath.Join(dir, "renderfile.yaml"),
+		Renderfile: Renderfile{
+			Apps: []App{
+				{
+					Name: "cert-manager",
+					Bundles: []Bundle{
+						{Name: "crds", Sources: []string{"a.yaml"}},
+						{Name: "crds", Sources: []string{"b.yaml"}},
+						{Name: "issuers", Sources: []string{"a.yaml", "b.yaml"}},
+					},
+				},
+				{
+					Name:     "external-dns",
+					Releases: []Release{{Name: "external-dns"}, {Name: "external-dns"}},
+					Bundles:  []Bundle{{Name: "crds", Sources: []string{"b.yaml"}}},
+				},
+				{
+					Name:     "ingress-nginx",
+					Disabled: true,
+					Bundles:  []Bundle{{Name: "crds", Sources: []string{"a.yaml"}}},
+				},
+			},
+		},
+	}
+	tests := []struct {
+		name     string
+		appNames []string
+		srcTypes []string
+		dryRun   bool
+	}{
+		{
+			name:     "should stream manifests of sources rendered by several jobs",
+			appNames: []string{"cert-manager", "external-dns", "ingress-nginx"},
+			srcTypes: []string{"bundle"},
+		},
+		{
+			name:     "should stream manifests of releases listed more than once",
+			appNames: []string{"external-dns"},
+			srcTypes: []string{"release"},
+			dryRun:   true,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			renders, err := GetRenders(cfg, tt.appNames, nil, tt.srcTypes, false, tt.dryRun, false)
+			if err != nil {
+				t.Fatalf("GetRenders() error = %v", err)
+			}
+			want := GetManifests(renders)
+
+			got := make([]*Manifest, 0)
+			err = StreamManifests(cfg, tt.appNames, nil, tt.srcTypes, false, tt.dryRun, false, func(manifest *Manifest) error {
+				got = append(got, manifest)
+				return nil
+			})
+			if err != nil {
+				t.Fatalf("StreamManifests() error = %v", err)
+			}
+			sort.Slice(got, func(i, j int) bool {
+				return getOutputFilePath(got[i].AppName, got[i].SrcName, got[i].SrcType) <
+					getOutputFilePath(got[j].AppName, got[j].SrcName, got[j].SrcType)
+			})
+			if !reflect.DeepEqual(got, want) {
+				t.Errorf("StreamManifests() = %v, want %v", got, want)
+			}
+		})
+	}
+}
+
+func TestStreamManifests_error(t *testing.T) {
+	dir := t.TempDir()
+	if err := os.WriteFile(filepath.Join(dir, "a.yaml"), []byte("kind: A\n"), 0644); err != nil {
+		t.Fatal(err)
+	}
+	bundles := make([]Bundle, 0)
+	for i := 0; i < 4*runtime.NumCPU(); i++ {
+		bundles = append(bundles, Bundle{Name: fmt.Sprintf("bundle-%d", i), Sources: []string{"a.yaml"}})
+	}
+	bundles = append(bundles, Bundle{Name: "missing", Sources: []string{"missing.yaml"}})
+	cfg := &Config{
+		Path: filepath.Join(dir, "renderfile.yaml"),
+		Renderfile: Renderfile{
+			Apps: []App{{Name: "cert-manager", Bundles: bundles}},
+		},
+	}
+	tests := []struct {
+		name string
+		fn   func(*Manifest) error
+	}{
+		{
+			name: "should return render errors once jobs are done",
+			fn:   func(*Manifest) error { return nil },
+		},
+		{
+			name: "should return fn errors once jobs are done",
+			fn:   func(*Manifest) error { return fmt.Errorf("failed") },
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			goroutines := runtime.NumGoroutine()
+			err := StreamManifests(cfg, []string{"cert-manager"}, nil, []string{"bundle"}, false, false, false, tt.fn)
+			if err == nil {
+				t.Fatalf("StreamManifests() error = nil, want error")
+			}
+			if got := runtime.NumGoroutine(); got > goroutines {
+				t.Errorf("StreamManifests() left %d goroutines running", got-goroutines)
+			}
+		})
+	}
+}
@@ -1,8 +1,14 @@
 package core
 
 import (
+	"bytes"
+	"encoding/json"
 	"fmt"
+	"io"
 	"os"
+	"path"
+	"regexp"
+	"strings"
 
 	"gopkg.in/yaml.v3"
 )
@@ -14,11 +20,17 @@ type Helmfile struct {
 }
 
 // getHelmfileHelmChartAndVersion return the Helm chart and version for a release in a Helmfile.
-func getHelmfileHelmChartAndVersion(helmfile, releaseName string) (string, string, error) {
-	// Load data from Helmfile.yaml
-	helmfileData, err := loadHelmfile(helmfile)
-	if err != nil {
-		return "", "", err
+// Loaded Helmfiles are kept in the helmfiles map by path, as the same Helmfile is typically shared by many releases.
+func getHelmfileHelmChartAndVersion(helmfiles map[string]*Helmfile, helmfile, releaseName string) (string, string, error) {
+	// Load data from Helmfile.yaml, unless already loaded.
+	helmfileData, ok := helmfiles[helmfile]
+	if !ok {
+		var err error
+		helmfileData, err = loadHelmfile(helmfile)
+		if err != nil {
+			return "", "", err
+		}
+		helmfiles[helmfile] = helmfileData
 	}
 	// Find the release in the Helmfile.
 	for _, release := range helmfileData.Releases {
@@ -30,14 +42,214 @@ func getHelmfileHelmChartAndVersion(helmfile, releaseName string) (string, strin
 }
 
 // loadHelmfile loads a Helmfile from local disk.
+// The file is decoded directly from the open file rather than read fully into memory first.
 func loadHelmfile(path string) (*Helmfile, error) {
-	data, err := os.ReadFile(path)
+	file, err := os.Open(path)
 	if err != nil {
 		return nil, err
 	}
+	defer func(file *os.File) {
+		if err := file.Close(); err != nil {
+			fmt.Printf("failed to close Helmfile: %v", err)
+		}
+	}(file)
+
 	helmfile := &Helmfile{Path: path}
-	if err := yaml.Unmarshal(data, &helmfile); err != nil {
+	if err := yaml.NewDecoder(file).Decode(helmfile); err != nil {
 		return nil, err
 	}
 	return helmfile, nil
 }
+
+// helmfileListEntry represents a release in the JSON output of the 'helmfile list' command.
+type helmfileListEntry struct {
+	Name  string `json:"name"`
+	Chart string `json:"chart"`
+}
+
+// getHelmfileReleaseCharts returns the chart names of the releases in a Helmfile by release name.
+// The 'helmfile list' command is used as Helmfiles are templates that must be rendered to be read.
+// The output is cached in cacheDir if not empty, unless the files the Helmfile reads cannot be determined.
+func getHelmfileReleaseCharts(helmfile, cacheDir string) (map[string]string, error) {
+	args := []string{"helmfile", "list", "--file", helmfile, "--output", "json"}
+	inputs, ok := getHelmfileInputs(helmfile)
+	if !ok {
+		cacheDir = ""
+	}
+	_, stdout, stderr, exitCode, err := execCachedCmd(cacheDir, args, path.Dir(helmfile), inputs)
+	if err != nil {
+		return nil, err
+	}
+	if exitCode != 0 {
+		return nil, fmt.Errorf("helmfile list failed with exit code %d: %s", exitCode, string(stderr))
+	}
+	entries := make([]helmfileListEntry, 0)
+	if err := json.Unmarshal(stdout, &entries); err != nil {
+		return nil, err
+	}
+	charts := make(map[string]string, len(entries))
+	for _, entry := range entries {
+		charts[entry.Name] = path.Base(entry.Chart)
+	}
+	return charts, nil
+}
+
+// helmfileDeclaredInputs represents the parts of a Helmfile declaring the files read to render its releases.
+// Fields are decoded as nodes, as Helmfiles are templates and their values may be template expressions.
+type helmfileDeclaredInputs struct {
+	Bases        []yaml.Node `yaml:"bases"`
+	Helmfiles    []yaml.Node `yaml:"helmfiles"`
+	Environments map[string]struct {
+		Values []yaml.Node `yaml:"values"`
+	} `yaml:"environments"`
+	Releases []struct {
+		Chart   yaml.Node   `yaml:"chart"`
+		Version yaml.Node   `yaml:"version"`
+		Values  []yaml.Node `yaml:"values"`
+	} `yaml:"releases"`
+}
+
+// getHelmfileInputs returns the files read to render the releases in a Helmfile: the Helmfile itself,
+// the values files declared by its environments and releases, and the local charts of its releases.
+// It returns false if they cannot be determined without rendering the Helmfile, if they include remote
+// files, if the Helmfile or its values files read the environment or other files, or if a release uses
+// the latest version of a chart, in which case its renders cannot be cached.
+func getHelmfileInputs(helmfile string) ([]string, bool) {
+	data, err := os.ReadFile(helmfile)
+	if err != nil || readsEnvironment(data) {
+		return nil, false
+	}
+
+	var declared helmfileDeclaredInputs
+	decoder := yaml.NewDecoder(bytes.NewReader(data))
+	if err := decoder.Decode(&declared); err != nil {
+		return nil, false
+	}
+	// Multiple documents, bases, and nested Helmfiles may declare anything.
+	if err := decoder.Decode(&yaml.Node{}); err != io.EOF {
+		return nil, false
+	}
+	if len(declared.Bases) > 0 || len(declared.Helmfiles) > 0 {
+		return nil, false
+	}
+
+	dir := path.Dir(helmfile)
+	inputs := []string{helmfile}
+	addValues := func(values []yaml.Node) bool {
+		for _, value := range values {
+			switch {
+			case value.Kind == yaml.ScalarNode && !strings.Contains(value.Value, "{{") && !isURL(value.Value):
+				valuesFile := resolvePath(dir, value.Value)
+				data, err := os.ReadFile(valuesFile)
+				if err != nil || readsEnvironment(data) {
+					return false
+				}
+				inputs = append(inputs, valuesFile)
+			case value.Kind == yaml.MappingNode && !isTemplateNode(&value):
+				// Inline values are part of the Helmfile itself.
+			default:
+				return false
+			}
+		}
+		return true
+	}
+	for _, environment := range declared.Environments {
+		if !addValues(environment.Values) {
+			return nil, false
+		}
+	}
+	for _, release := range declared.Releases {
+		if !addValues(release.Values) {
+			return nil, false
+		}
+		if release.Chart.Kind != yaml.ScalarNode {
+			// Templated charts are assumed to be resolved from declared values, which are fingerprinted.
+			continue
+		}
+		if isLocalChart(release.Chart.Value, dir) {
+			inputs = append(inputs, resolvePath(dir, release.Chart.Value))
+		} else if release.Version.Kind == 0 || (release.Version.Kind == yaml.ScalarNode && release.Version.Value == "") {
+			return nil, false
+		}
+	}
+	return inputs, true
+}
+
+// environmentFuncPattern matches template actions calling Helmfile template functions which read
+// environment variables, command output, or other files, none of which are fingerprinted.
+var environmentFuncPattern = regexp.MustCompile(`\{\{[^}]*[\s({|-](env|requiredEnv|exec|readFile)[\s)}]`)
+
+// readsEnvironment returns true if a Helmfile or values file template reads the environment or other files.
+func readsEnvironment(data []byte) bool {
+	return environmentFuncPattern.Match(data)
+}
+
+// isTemplateNode returns true if a YAML node is a template expression like '{{ .Values.name }}',
+// which parses as a mapping with a mapping key.
+func isTemplateNode(node *yaml.Node) bool {
+	if node.Kind != yaml.MappingNode {
+		return false
+	}
+	for i := 0; i < len(node.Content); i += 2 {
+		if node.Content[i].Kind != yaml.ScalarNode {
+			return true
+		}
+	}
+	return false
+}
+
+// helmSourcePrefix is the prefix of the comment helm adds to each rendered document naming its template.
+const helmSourcePrefix = "# Source: "
+
+// splitHelmfileTemplateOutput splits the output of a 'helmfile template' command rendering multiple
+// releases into the output of each release, given the chart name of each release by release name.
+// Documents are attributed to releases by the '# Source: <chart>/<template>' comment helm adds to
+// each one. An error is returned if any document cannot be attributed to exactly one release.
+func splitHelmfileTemplateOutput(stdout []byte, releaseCharts map[string]string) (map[string][]byte, error) {
+	releasesByChart := make(map[string]string, len(releaseCharts))
+	for release, chart := range releaseCharts {
+		if _, ok := releasesByChart[chart]; ok {
+			return nil, fmt.Errorf("chart '%s' is used by multiple releases", chart)
+		}
+		releasesByChart[chart] = release
+	}
+
+	outputs := make(map[string][]byte, len(releaseCharts))
+	release := ""
+	var separator []byte
+	for _, line := range bytes.SplitAfter(stdout, []byte("\n")) {
+		trimmed := strings.TrimSpace(string(line))
+		if isDocumentSeparator(string(line)) {
+			separator = line
+			continue
+		}
+		if separator != nil {
+			if trimmed == "" {
+				continue
+			}
+			if !strings.HasPrefix(trimmed, helmSourcePrefix) {
+				return nil, fmt.Errorf("document has no source comment: %s", trimmed)
+			}
+			chart, _, _ := strings.Cut(strings.TrimPrefix(trimmed, helmSourcePrefix), "/")
+			var ok bool
+			if release, ok = releasesByChart[chart]; !ok {
+				return nil, fmt.Errorf("document has unknown chart '%s'", chart)
+			}
+			outputs[release] = append(outputs[release], separator...)
+			separator = nil
+		}
+		if release == "" {
+			if trimmed != "" {
+				return nil, fmt.Errorf("output precedes first document: %s", trimmed)
+			}
+			continue
+		}
+		outputs[release] = append(outputs[release], line...)
+	}
+	for release := range releaseCharts {
+		if _, ok := outputs[release]; !ok {
+			return nil, fmt.Errorf("no documents rendered for release '%s'", release)
+		}
+	}
+	return outputs, nil
+}
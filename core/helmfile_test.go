@@ -0,0 +1,144 @@
+package core
+
+import (
+	"reflect"
+	"testing"
+)
+
+func Test_splitHelmfileTemplateOutput(t *testing.T) {
+	type args struct {
+		stdout        string
+		releaseCharts map[string]string
+	}
+	tests := []struct {
+		name    string
+		args    args
+		want    map[string]string
+		wantErr bool
+	}{
+		{
+			name: "should split output by release",
+			args: args{
+				stdout: "---\n# Source: cert-manager/templates/a.yaml\nkind: A\n" +
+					"---\n# Source: external-dns/templates/b.yaml\nkind: B\n" +
+					"---\n# Source: cert-manager/charts/sub/templates/c.yaml\nkind: C\n",
+				releaseCharts: map[string]string{
+					"cert-manager": "cert-manager",
+					"external-dns": "external-dns",
+				},
+			},
+			want: map[string]string{
+				"cert-manager": "---\n# Source: cert-manager/templates/a.yaml\nkind: A\n" +
+					"---\n# Source: cert-manager/charts/sub/templates/c.yaml\nkind: C\n",
+				"external-dns": "---\n# Source: external-dns/templates/b.yaml\nkind: B\n",
+			},
+		},
+		{
+			name: "should not split output on separators in block scalars",
+			args: args{
+				stdout: "---\n# Source: prometheus/templates/rules.yaml\nkind: ConfigMap\ndata:\n  rules.yaml: |\n    ---\n    foo: 1\n" +
+					"---\n# Source: external-dns/templates/b.yaml\nkind: B\n",
+				releaseCharts: map[string]string{
+					"prometheus":   "prometheus",
+					"external-dns": "external-dns",
+				},
+			},
+			want: map[string]string{
+				"prometheus":   "---\n# Source: prometheus/templates/rules.yaml\nkind: ConfigMap\ndata:\n  rules.yaml: |\n    ---\n    foo: 1\n",
+				"external-dns": "---\n# Source: external-dns/templates/b.yaml\nkind: B\n",
+			},
+		},
+		{
+			name: "should fail if releases share a chart",
+			args: args{
+				stdout: "---\n# Source: nginx/templates/a.yaml\nkind: A\n",
+				releaseCharts: map[string]string{
+					"a": "nginx",
+					"b": "nginx",
+				},
+			},
+			wantErr: true,
+		},
+		{
+			name: "should fail if document has unknown chart",
+			args: args{
+				stdout: "---\n# Source: other/templates/a.yaml\nkind: A\n",
+				releaseCharts: map[string]string{
+					"a": "nginx",
+				},
+			},
+			wantErr: true,
+		},
+		{
+			name: "should fail if release has no documents",
+			args: args{
+				stdout: "---\n# Source: nginx/templates/a.yaml\nkind: A\n",
+				releaseCharts: map[string]string{
+					"a": "nginx",
+					"b": "redis",
+				},
+			},
+			wantErr: true,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			got, err := splitHelmfileTemplateOutput([]byte(tt.args.stdout), tt.args.releaseCharts)
+			if (err != nil) != tt.wantErr {
+				t.Errorf("splitHelmfileTemplateOutput() error = %v, wantErr %v", err, tt.wantErr)
+				return
+			}
+			if tt.wantErr {
+				return
+			}
+			gotStrings := make(map[string]string, len(got))
+			for release, output := range got {
+				gotStrings[release] = string(output)
+			}
+			if !reflect.DeepEqual(gotStrings, tt.want) {
+				t.Errorf("splitHelmfileTemplateOutput() got = %v, want %v", gotStrings, tt.want)
+			}
+		})
+	}
+}
+
+func Test_readsEnvironment(t *testing.T) {
+	tests := []struct {
+		name string
+		data string
+		want bool
+	}{
+		{
+			name: "should return false for values",
+			data: "replicas: {{ .Values.replicas }}\nenv: {{ .Environment.Name }}\n",
+			want: false,
+		},
+		{
+			name: "should return true for env",
+			data: "domain: {{ env \"DOMAIN\" | default \"example.com\" }}\n",
+			want: true,
+		},
+		{
+			name: "should return true for requiredEnv",
+			data: "token: {{- requiredEnv \"TOKEN\" }}\n",
+			want: true,
+		},
+		{
+			name: "should return true for exec",
+			data: "version: {{ exec \"git\" (list \"describe\") }}\n",
+			want: true,
+		},
+		{
+			name: "should return true for readFile",
+			data: "config: {{ readFile \"config.yaml\" | quote }}\n",
+			want: true,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := readsEnvironment([]byte(tt.data)); got != tt.want {
+				t.Errorf("readsEnvironment() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
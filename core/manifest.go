@@ -1,7 +1,11 @@
 package core
 
 import (
+	"bufio"
+	"bytes"
+	"errors"
 	"fmt"
+	"io"
 	"os"
 	"path"
 	"path/filepath"
@@ -19,23 +23,108 @@ type Manifest struct {
 // Doc returns the assembled, cleaned Manifest renders as a single document.
 // It adds a source header comment followed by all the yaml renders separated by '---'.
 func (m *Manifest) Doc() string {
-	header := fmt.Sprintf("#:manifestus render{appName=%s, srcName=%s, srcType=%s}", m.AppName, m.SrcName, m.SrcType)
-	docs := make([]string, 0)
-	for _, render := range m.Renders {
-		docs = append(docs, render.Doc())
+	var doc strings.Builder
+	_, _ = m.WriteTo(&doc)
+	return doc.String()
+}
+
+// WriteTo writes the assembled, cleaned Manifest renders as a single document to a writer.
+// It writes the same document as Doc, one render at a time, without assembling it in memory first.
+func (m *Manifest) WriteTo(w io.Writer) (int64, error) {
+	var total int64
+	write := func(s string) error {
+		n, err := io.WriteString(w, s)
+		total += int64(n)
+		return err
+	}
+	header := fmt.Sprintf("#:manifestus render{appName=%s, srcName=%s, srcType=%s}\n", m.AppName, m.SrcName, m.SrcType)
+	if err := write(header); err != nil {
+		return total, err
 	}
-	return fmt.Sprintf("%s\n%s", header, strings.Join(docs, "\n---\n"))
+	for i, render := range m.Renders {
+		if i > 0 {
+			if err := write("\n---\n"); err != nil {
+				return total, err
+			}
+		}
+		// Write the trimmed render output as is, rather than copying it into a string with render.Doc().
+		n, err := w.Write(bytes.TrimSpace(render.Stdout))
+		total += int64(n)
+		if err != nil {
+			return total, err
+		}
+	}
+	return total, nil
 }
 
-// Write writes the manifest to a file in the output directory.
-func (m *Manifest) Write(outputDir string) (string, error) {
+// Write writes the manifest to a file in the output directory, returning its path and whether it was written.
+// The file is left untouched if it already contains the manifest document.
+func (m *Manifest) Write(outputDir string) (string, bool, error) {
 	p := path.Join(outputDir, getOutputFilePath(m.AppName, m.SrcName, m.SrcType))
 	if p, err := filepath.Abs(p); err != nil {
-		return p, err
+		return p, false, err
+	}
+	if m.isWritten(p) {
+		return p, false, nil
 	}
 	if err := os.MkdirAll(path.Dir(p), 0755); err != nil {
-		return p, err
+		return p, false, err
+	}
+	file, err := os.OpenFile(p, os.O_WRONLY|os.O_CREATE|os.O_TRUNC, 0644)
+	if err != nil {
+		return p, false, err
+	}
+	writer := bufio.NewWriter(file)
+	if _, err := m.WriteTo(writer); err != nil {
+		_ = file.Close()
+		return p, false, err
+	}
+	if err := writer.Flush(); err != nil {
+		_ = file.Close()
+		return p, false, err
+	}
+	return p, true, file.Close()
+}
+
+// isWritten tests if the file at a path already contains the manifest document.
+// The document is compared with the file as it is streamed, without assembling it in memory.
+func (m *Manifest) isWritten(p string) bool {
+	file, err := os.Open(p)
+	if err != nil {
+		return false
+	}
+	defer func(file *os.File) {
+		_ = file.Close()
+	}(file)
+	reader := bufio.NewReader(file)
+	if _, err := m.WriteTo(&compareWriter{r: reader}); err != nil {
+		return false
+	}
+	// The file must not have any data beyond the document either.
+	_, err = reader.ReadByte()
+	return err == io.EOF
+}
+
+// errDataDiffers is returned by compareWriter when written data differs from the data read.
+var errDataDiffers = errors.New("data differs")
+
+// compareWriter is a writer that fails if data written to it differs from data read from its reader.
+type compareWriter struct {
+	r   io.Reader
+	buf []byte
+}
+
+// Write compares data written with the next data read from the reader.
+func (w *compareWriter) Write(p []byte) (int, error) {
+	if cap(w.buf) < len(p) {
+		w.buf = make([]byte, len(p))
+	}
+	buf := w.buf[:len(p)]
+	if _, err := io.ReadFull(w.r, buf); err != nil {
+		return 0, errDataDiffers
+	}
+	if !bytes.Equal(buf, p) {
+		return 0, errDataDiffers
 	}
-	err := os.WriteFile(p, []byte(m.Doc()), 0644)
-	return p, err
+	return len(p), nil
 }
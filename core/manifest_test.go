@@ -0,0 +1,109 @@
+package core
+
+import (
+	"bytes"
+	"os"
+	"testing"
+)
+
+func TestManifest_WriteTo(t *testing.T) {
+	tests := []struct {
+		name     string
+		manifest Manifest
+		want     string
+	}{
+		{
+			name: "should write header and renders separated by '---'",
+			manifest: Manifest{
+				AppName: "cert-manager",
+				SrcName: "crds",
+				SrcType: "bundle",
+				Renders: Renders{
+					{Stdout: []byte("\nkind: A\n")},
+					{Stdout: []byte("kind: B\n\n")},
+				},
+			},
+			want: "#:manifestus render{appName=cert-manager, srcName=crds, srcType=bundle}\nkind: A\n---\nkind: B",
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var buf bytes.Buffer
+			n, err := tt.manifest.WriteTo(&buf)
+			if err != nil {
+				t.Fatalf("WriteTo() error = %v", err)
+			}
+			if got := buf.String(); got != tt.want {
+				t.Errorf("WriteTo() got = %q, want %q", got, tt.want)
+			}
+			if n != int64(buf.Len()) {
+				t.Errorf("WriteTo() n = %d, want %d", n, buf.Len())
+			}
+			if got := tt.manifest.Doc(); got != tt.want {
+				t.Errorf("Doc() got = %q, want %q", got, tt.want)
+			}
+		})
+	}
+}
+
+func TestManifest_Write(t *testing.T) {
+	manifest := Manifest{
+		AppName: "cert-manager",
+		SrcName: "crds",
+		SrcType: "bundle",
+		Renders: Renders{
+			{Stdout: []byte("kind: A\n")},
+		},
+	}
+	outputDir := t.TempDir()
+	p, written, err := manifest.Write(outputDir)
+	if err != nil {
+		t.Fatalf("Write() error = %v", err)
+	}
+	if !written {
+		t.Errorf("Write() written = false for new file, want true")
+	}
+	if !manifest.isWritten(p) {
+		t.Errorf("isWritten() = false after Write(), want true")
+	}
+	if _, written, err := manifest.Write(outputDir); err != nil || written {
+		t.Errorf("Write() written = %v, error = %v for unchanged file, want false, nil", written, err)
+	}
+
+	tests := []struct {
+		name     string
+		contents string
+		want     bool
+	}{
+		{
+			name:     "should be written if file has same document",
+			contents: manifest.Doc(),
+			want:     true,
+		},
+		{
+			name:     "should not be written if file has different document",
+			contents: "#:manifestus render{}\nkind: B",
+			want:     false,
+		},
+		{
+			name:     "should not be written if file has trailing data",
+			contents: manifest.Doc() + "\n",
+			want:     false,
+		},
+		{
+			name:     "should not be written if file is truncated",
+			contents: manifest.Doc()[:10],
+			want:     false,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if err := os.WriteFile(p, []byte(tt.contents), 0644); err != nil {
+				t.Fatal(err)
+			}
+			if got := manifest.isWritten(p); got != tt.want {
+				t.Errorf("isWritten() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
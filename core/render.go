@@ -4,6 +4,7 @@ import (
 	"fmt"
 	"os/exec"
 	"path"
+	"runtime"
 	"strings"
 )
 
@@ -12,7 +13,8 @@ var ValidSrcTypes = []string{"release", "kustomization", "bundle"}
 
 // Renders is a collection of Render objects containing states of all attempted
 // renders for an App from its configured sources and their renderers.
-type Renders []*Render
+// Renders are stored by value, as they are never modified once rendered.
+type Renders []Render
 
 // Render represents a rendered document for an App from some source.
 // The source can be a Helm or Helmfile Release, a Kustomization, or a Bundle.
@@ -39,7 +41,7 @@ type Render struct {
 	Cmd *exec.Cmd
 
 	// Stdout is the standard output, if any, of the command that was executed to render the document.
-	// For static manifests, this is the contents of the file.
+	// For static manifests, this is the contents of the file, which is written to manifests without being copied.
 	Stdout []byte
 
 	// Stderr is the standard error output, if any,of the command that was executed to render the document.
@@ -56,11 +58,24 @@ func (r Render) Doc() string {
 }
 
 // Docs returns normalized, rendered manifests documents from render command output in stdout.
+// Documents are split on unindented '---' separator lines, and empty documents are omitted.
 func (r Render) Docs() []string {
 	docs := make([]string, 0)
-	for _, doc := range docs {
-		docs = append(docs, strings.TrimSpace(doc))
+	var doc strings.Builder
+	appendDoc := func() {
+		if trimmed := strings.TrimSpace(doc.String()); trimmed != "" {
+			docs = append(docs, trimmed)
+		}
+		doc.Reset()
+	}
+	for _, line := range strings.SplitAfter(string(r.Stdout), "\n") {
+		if isDocumentSeparator(line) {
+			appendDoc()
+			continue
+		}
+		doc.WriteString(line)
 	}
+	appendDoc()
 	return docs
 }
 
@@ -73,197 +88,474 @@ func (r Render) Msg() string {
 // helmfileName is the default name of a Helmfile.
 const helmfileName = "helmfile.yaml"
 
-// getRendersForApp returns a list of rendered manifests for a named app in the Config.
-func getRendersForApp(app *App, srcNames, srcTypes []string, debug, dryRun bool) (Renders, error) {
-	results := make([]*Render, 0)
-	if contains(srcTypes, "release") {
+// maxConcurrentFetches is the maximum number of bundle URLs fetched at once.
+const maxConcurrentFetches = 16
+
+// renderer renders the sources of Apps in a Config with the same options.
+// It is never modified once created, so it is safe for use by concurrent render jobs.
+// Sources shared by multiple apps are only rendered once, with results shared by their renders
+// until all render jobs using them are done.
+type renderer struct {
+	// configDir is the directory of the Config, used to resolve relative paths in it.
+	configDir string
+
+	// debug enables debug output of render commands.
+	debug bool
+
+	// dryRun disables execution of render commands, only returning their command lines.
+	dryRun bool
+
+	// cacheDir is the directory of the render cache, or empty if renders aren't cached.
+	cacheDir string
+
+	// cmdResults holds the results of render commands executed for releases and kustomizations.
+	cmdResults *onceGroup[cmdResult]
+
+	// documents holds the static manifest documents read or fetched for bundles.
+	documents *onceGroup[[]byte]
+}
+
+// newRenderer returns a renderer of the sources of Apps in a Config.
+// Renders are read from and written to the render cache if cache is true and the cache is enabled,
+// in which case renders not used for a while are pruned from it first.
+func newRenderer(cfg *Config, debug, dryRun, cache bool) renderer {
+	dir := ""
+	if cache {
+		dir = cacheDir()
+	}
+	if dir != "" {
+		pruneCache(dir)
+	}
+	return renderer{
+		configDir:  cfg.Dir(),
+		debug:      debug,
+		dryRun:     dryRun,
+		cacheDir:   dir,
+		cmdResults: &onceGroup[cmdResult]{},
+		documents:  &onceGroup[[]byte]{},
+	}
+}
+
+// cmdResult is the result of executing a render command for a source.
+type cmdResult struct {
+	cmdLine string
+	cmd     *exec.Cmd
+	stdout  []byte
+	stderr  []byte
+}
+
+// newCmdResult returns a cmdResult from the results returned by the exec*Cmd functions.
+func newCmdResult(cmdLine string, cmd *exec.Cmd, stdout, stderr []byte, err error) (cmdResult, error) {
+	return cmdResult{cmdLine: cmdLine, cmd: cmd, stdout: stdout, stderr: stderr}, err
+}
+
+// render returns a Render of an App source from the result of its render command.
+func (c cmdResult) render(appName, srcName, srcType string, err error) Render {
+	return Render{
+		AppName: appName,
+		SrcName: srcName,
+		SrcType: srcType,
+		CmdLine: c.cmdLine,
+		Cmd:     c.cmd,
+		Stdout:  c.stdout,
+		Stderr:  c.stderr,
+		Err:     err,
+	}
+}
+
+// manifestKey identifies the Manifest of a source of an App.
+type manifestKey struct {
+	appName string
+	srcName string
+	srcType string
+}
+
+// renderJob renders one or more sources of Apps into Renders.
+type renderJob struct {
+	// keys identifies the Manifests of the sources rendered by the job.
+	keys []manifestKey
+
+	// render renders the sources.
+	render func() (Renders, error)
+}
+
+// helmfileRelease is a Release of a named App rendered from a Helmfile.
+type helmfileRelease struct {
+	appName string
+	release Release
+}
+
+// getRenderJobs returns the jobs rendering the selected sources of named apps in the Config.
+// Sources are selected by sets of source names and types, where an empty set of names selects all.
+// Disabled apps are skipped, even if named. Releases of all apps from the same Helmfile are rendered together.
+func (r renderer) getRenderJobs(cfg *Config, appNames []string, srcNameSet, srcTypeSet map[string]bool) []renderJob {
+	jobs := make([]renderJob, 0)
+	helmfiles := make([]string, 0)
+	helmfileReleases := make(map[string][]helmfileRelease)
+	for _, appName := range appNames {
+		app := cfg.FindApp(appName)
+		if app.Disabled {
+			continue
+		}
+		appJobs, appHelmfileReleases := r.getRenderJobsForApp(app, srcNameSet, srcTypeSet)
+		jobs = append(jobs, appJobs...)
+		for _, hr := range appHelmfileReleases {
+			helmfile := getReleaseHelmfile(r.configDir, hr.release)
+			if _, ok := helmfileReleases[helmfile]; !ok {
+				helmfiles = append(helmfiles, helmfile)
+			}
+			helmfileReleases[helmfile] = append(helmfileReleases[helmfile], hr)
+		}
+	}
+	for _, helmfile := range helmfiles {
+		jobs = append(jobs, r.getHelmfileRenderJob(helmfile, helmfileReleases[helmfile]))
+	}
+	return jobs
+}
+
+// getRenderJobsForApp returns the jobs rendering the selected sources of an App.
+// Releases rendered from a Helmfile are returned instead of jobs for them, so that
+// releases from the same Helmfile can be rendered together with getHelmfileRenderJob.
+// Shared results of each job are expected, so they can be forgotten once all jobs using them are done.
+func (r renderer) getRenderJobsForApp(app *App, srcNameSet, srcTypeSet map[string]bool) ([]renderJob, []helmfileRelease) {
+	jobs := make([]renderJob, 0)
+	helmfileReleases := make([]helmfileRelease, 0)
+	if srcTypeSet["release"] {
 		for _, release := range app.Releases {
-			if len(srcNames) > 0 && !contains(srcNames, release.Name) {
+			if len(srcNameSet) > 0 && !srcNameSet[release.Name] {
 				continue
 			}
-			render, err := renderRelease(app.Name, release, debug, dryRun)
-			if err != nil {
-				return nil, err
+			if release.Chart == "" {
+				helmfileReleases = append(helmfileReleases, helmfileRelease{app.Name, release})
+				continue
 			}
-			results = append(results, render)
+			r.cmdResults.expect(r.releaseKey(release))
+			jobs = append(jobs, renderJob{
+				keys: []manifestKey{{app.Name, release.Name, "release"}},
+				render: func() (Renders, error) {
+					render, err := r.renderRelease(app.Name, release)
+					if err != nil {
+						return nil, err
+					}
+					return Renders{render}, nil
+				},
+			})
 		}
 	}
-	if contains(srcTypes, "kustomization") {
+	if srcTypeSet["kustomization"] {
 		for _, kustomization := range app.Kustomizations {
-			if len(srcNames) > 0 && !contains(srcNames, kustomization.Name) {
+			if len(srcNameSet) > 0 && !srcNameSet[kustomization.Name] {
 				continue
 			}
-			render, err := renderKustomization(app.Name, kustomization, dryRun)
-			if err != nil {
-				return nil, err
-			}
-			results = append(results, render)
+			r.cmdResults.expect(kustomizationKey(kustomization))
+			jobs = append(jobs, renderJob{
+				keys: []manifestKey{{app.Name, kustomization.Name, "kustomization"}},
+				render: func() (Renders, error) {
+					render, err := r.renderKustomization(app.Name, kustomization)
+					if err != nil {
+						return nil, err
+					}
+					return Renders{render}, nil
+				},
+			})
 		}
 	}
-	if contains(srcTypes, "bundle") {
+	if srcTypeSet["bundle"] {
 		for _, bundle := range app.Bundles {
-			if len(srcNames) > 0 && !contains(srcNames, bundle.Name) {
+			if len(srcNameSet) > 0 && !srcNameSet[bundle.Name] {
 				continue
 			}
-			renders, err := renderBundle(app.Name, bundle)
+			// Sources are expanded once here, both to expect their documents and to render them.
+			paths, urls, err := bundle.expandSources()
+			for i, source := range paths {
+				paths[i] = path.Join(r.configDir, source)
+				r.documents.expect(pathDocumentKey(paths[i]))
+			}
+			for _, source := range urls {
+				r.documents.expect(urlDocumentKey(source))
+			}
+			jobs = append(jobs, renderJob{
+				keys: []manifestKey{{app.Name, bundle.Name, "bundle"}},
+				render: func() (Renders, error) {
+					if err != nil {
+						return nil, err
+					}
+					return r.renderBundle(app.Name, bundle.Name, paths, urls)
+				},
+			})
+		}
+	}
+	return jobs, helmfileReleases
+}
+
+// getHelmfileRenderJob returns a job rendering releases from the same Helmfile.
+// Multiple releases are rendered with a single 'helmfile template' command when
+// its output can be split by release, otherwise each release is rendered on its own.
+func (r renderer) getHelmfileRenderJob(helmfile string, releases []helmfileRelease) renderJob {
+	// An app may list the same release more than once, but each manifest key must only be listed once.
+	keys := make([]manifestKey, 0, len(releases))
+	seen := make(map[manifestKey]bool, len(releases))
+	for _, hr := range releases {
+		key := manifestKey{hr.appName, hr.release.Name, "release"}
+		if !seen[key] {
+			keys = append(keys, key)
+			seen[key] = true
+		}
+	}
+	return renderJob{
+		keys: keys,
+		render: func() (Renders, error) {
+			if len(releases) > 1 {
+				if renders, ok := r.renderHelmfileReleases(helmfile, releases); ok {
+					return renders, nil
+				}
+			}
+			rendered, err := mapConcurrent(releases, runtime.NumCPU(), func(hr helmfileRelease) (Render, error) {
+				return r.renderRelease(hr.appName, hr.release)
+			})
 			if err != nil {
 				return nil, err
 			}
-			results = append(results, renders...)
-		}
+			return rendered, nil
+		},
 	}
-	return results, nil
 }
 
-// renderRelease returns render of a Helm chart release.
-func renderRelease(appName string, release Release, debug, dryRun bool) (*Render, error) {
-	// If the release has a chart, render it with 'helm template'.
-	if release.Chart != "" {
-		cmdLine, cmd, stdout, stderr, err := execHelmTemplateCmdline(release.Name, release.Chart, release.Version, release.Values, debug, dryRun)
-		return &Render{
-			AppName: appName,
-			SrcName: release.Name,
+// renderHelmfileReleases renders releases from the same Helmfile with a single 'helmfile template' command.
+// It returns false if the releases could not be rendered, or the output could not be split by release,
+// in which case the releases should be rendered one at a time for accurate error reporting.
+func (r renderer) renderHelmfileReleases(helmfile string, releases []helmfileRelease) (Renders, bool) {
+	releaseNames := make([]string, 0, len(releases))
+	seen := make(map[string]bool, len(releases))
+	for _, hr := range releases {
+		if !seen[hr.release.Name] {
+			releaseNames = append(releaseNames, hr.release.Name)
+			seen[hr.release.Name] = true
+		}
+	}
+	cmdline, cmd, stdout, stderr, err := execHelmfileTemplateCmd(releaseNames, helmfile, r.debug, r.dryRun, r.cacheDir)
+	if err != nil {
+		return nil, false
+	}
+
+	outputs := make(map[string][]byte, len(releaseNames))
+	if !r.dryRun {
+		charts, err := getHelmfileReleaseCharts(helmfile, r.cacheDir)
+		if err != nil {
+			return nil, false
+		}
+		releaseCharts := make(map[string]string, len(releaseNames))
+		for _, name := range releaseNames {
+			chart, ok := charts[name]
+			if !ok {
+				return nil, false
+			}
+			releaseCharts[name] = chart
+		}
+		outputs, err = splitHelmfileTemplateOutput(stdout, releaseCharts)
+		if err != nil {
+			return nil, false
+		}
+	}
+
+	renders := make(Renders, 0, len(releases))
+	for _, hr := range releases {
+		renders = append(renders, Render{
+			AppName: hr.appName,
+			SrcName: hr.release.Name,
 			SrcType: "release",
-			CmdLine: cmdLine,
+			CmdLine: cmdline,
 			Cmd:     cmd,
-			Stdout:  stdout,
+			Stdout:  outputs[hr.release.Name],
 			Stderr:  stderr,
-			Err:     err,
-		}, err
+		})
 	}
+	return renders, true
+}
 
-	// Otherwise, render the release with 'helmfile template'.
-	helmfile := release.Helmfile
-	if helmfile == "" {
-		helmfile = path.Join(configDir, helmfileName)
+// renderRelease returns render of a Helm chart release.
+// Identical releases of different apps are only rendered once, sharing the rendered output.
+func (r renderer) renderRelease(appName string, release Release) (Render, error) {
+	result, err := r.cmdResults.do(r.releaseKey(release), func() (cmdResult, error) {
+		// If the release has a chart, render it with 'helm template'.
+		if release.Chart != "" {
+			return newCmdResult(execHelmTemplateCmd(release.Name, release.Chart, release.Version, release.Values, r.debug, r.dryRun, r.cacheDir))
+		}
+		// Otherwise, render the release with 'helmfile template'.
+		return newCmdResult(execHelmfileTemplateCmd([]string{release.Name}, getReleaseHelmfile(r.configDir, release), r.debug, r.dryRun, r.cacheDir))
+	})
+	return result.render(appName, release.Name, "release", err), err
+}
+
+// releaseKey returns the key identifying the render command of a Release in cmdResults.
+func (r renderer) releaseKey(release Release) string {
+	helmfile := ""
+	if release.Chart == "" {
+		helmfile = getReleaseHelmfile(r.configDir, release)
 	}
-	cmdLine, cmd, stdout, stderr, err := execHelmfileTemplateCmd(release.Name, helmfile, debug, dryRun)
-	return &Render{
-		AppName: appName,
-		SrcName: release.Name,
-		SrcType: "release",
-		CmdLine: cmdLine,
-		Cmd:     cmd,
-		Stdout:  stdout,
-		Stderr:  stderr,
-		Err:     err,
-	}, err
+	return strings.Join([]string{"release", release.Name, release.Chart, release.Version, release.Values, helmfile}, "\x00")
+}
+
+// getReleaseHelmfile returns the path of the Helmfile used to render a Release.
+// If the Release doesn't specify one, the Helmfile in the config directory is used.
+func getReleaseHelmfile(configDir string, release Release) string {
+	if release.Helmfile == "" {
+		return path.Join(configDir, helmfileName)
+	}
+	return release.Helmfile
 }
 
 // renderKustomization renders an App Kustomization object.
-func renderKustomization(appName string, kustomization Kustomization, dryRun bool) (*Render, error) {
-	cmdLine, cmd, stdout, stderr, err := execKustomizeBuildCmd(kustomization.Source, dryRun)
-	return &Render{
-		AppName: appName,
-		SrcName: kustomization.Name,
-		SrcType: "kustomization",
-		CmdLine: cmdLine,
-		Cmd:     cmd,
-		Stdout:  stdout,
-		Stderr:  stderr,
-		Err:     err,
-	}, err
+// Identical kustomizations of different apps are only rendered once, sharing the rendered output.
+func (r renderer) renderKustomization(appName string, kustomization Kustomization) (Render, error) {
+	result, err := r.cmdResults.do(kustomizationKey(kustomization), func() (cmdResult, error) {
+		return newCmdResult(execKustomizeBuildCmd(kustomization.Source, r.dryRun))
+	})
+	return result.render(appName, kustomization.Name, "kustomization", err), err
 }
 
-// renderBundle renders an App Bundle object.
-func renderBundle(appName string, bundle Bundle) (Renders, error) {
-	renders := make(Renders, 0)
-	paths, err := bundle.Paths()
-	if err != nil {
-		return nil, err
-	}
+// kustomizationKey returns the key identifying the render command of a Kustomization in cmdResults.
+func kustomizationKey(kustomization Kustomization) string {
+	return strings.Join([]string{"kustomization", kustomization.Source}, "\x00")
+}
+
+// pathDocumentKey returns the key identifying a static manifest document read from a path in documents.
+func pathDocumentKey(path string) string {
+	return "path\x00" + path
+}
+
+// urlDocumentKey returns the key identifying a static manifest document fetched from a URL in documents.
+func urlDocumentKey(url string) string {
+	return "url\x00" + url
+}
+
+// renderBundle renders an App Bundle object from its expanded sources, with paths resolved against the config directory.
+func (r renderer) renderBundle(appName, bundleName string, paths, urls []string) (Renders, error) {
+	renders := make(Renders, 0, len(paths)+len(urls))
 	for _, source := range paths {
-		source = path.Join(configDir, source)
-		data, err := readDocument(source)
+		data, err := r.documents.do(pathDocumentKey(source), func() ([]byte, error) {
+			return readDocument(source)
+		})
 		if err != nil {
 			return nil, fmt.Errorf("failed to read %s: %w", source, err)
 		}
-		renders = append(renders, &Render{
+		renders = append(renders, Render{
 			AppName: appName,
-			SrcName: bundle.Name,
+			SrcName: bundleName,
 			SrcType: "bundle",
 			CmdLine: fmt.Sprintf("cat %s", source), // No command executed for static manifests. Diagnostic only.
 			Stdout:  data,
 			Err:     err,
 		})
 	}
-	urls, err := bundle.URLs()
-	if err != nil {
-		return nil, err
-	}
-	for _, source := range urls {
-		data, err := fetchDocument(source)
+	docs, err := mapConcurrent(urls, maxConcurrentFetches, func(source string) ([]byte, error) {
+		data, err := r.documents.do(urlDocumentKey(source), func() ([]byte, error) {
+			return fetchDocument(source)
+		})
 		if err != nil {
 			return nil, fmt.Errorf("failed to fetch %s: %w", source, err)
 		}
-		renders = append(renders, &Render{
+		return data, nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	for i, source := range urls {
+		renders = append(renders, Render{
 			AppName: appName,
-			SrcName: bundle.Name,
+			SrcName: bundleName,
 			SrcType: "bundle",
 			CmdLine: fmt.Sprintf("curl %s", source), // No command executed for static manifests. Diagnostic only.
-			Stdout:  data,
-			Err:     err,
+			Stdout:  docs[i],
 		})
 	}
 	return renders, nil
 }
 
-// getHelmfileTemplateCmdline returns a 'helmfile template' line command for a Release.
-func getHelmfileTemplateCmdline(releaseName, helmfile string, debug bool) string {
-	cmdline := fmt.Sprintf("helmfile template --file %s --selector name=%s --skip-deps", helmfile, releaseName)
+// getHelmfileTemplateArgs returns a 'helmfile template' command and args for one or more Releases.
+func getHelmfileTemplateArgs(releaseNames []string, helmfile string, debug bool) []string {
+	args := []string{"helmfile", "template", "--file", helmfile}
+	for _, releaseName := range releaseNames {
+		args = append(args, "--selector", "name="+releaseName)
+	}
+	args = append(args, "--skip-deps")
 	if debug {
-		cmdline += " --debug"
+		args = append(args, "--debug")
 	}
-	return cmdline
+	return args
 }
 
-// execHelmfileTemplateCmd executes a 'helmfile template' command for a Release and returns its command line, command, stdout, stderr and error.
-func execHelmfileTemplateCmd(releaseName, helmfile string, debug, dryRun bool) (string, *exec.Cmd, []byte, []byte, error) {
-	cmdline := getHelmfileTemplateCmdline(releaseName, helmfile, debug)
+// execHelmfileTemplateCmd executes a 'helmfile template' command for one or more Releases and returns its command line, command, stdout, stderr and error.
+// The output is cached in cacheDir if not empty, unless the files the Helmfile reads cannot be determined.
+func execHelmfileTemplateCmd(releaseNames []string, helmfile string, debug, dryRun bool, cacheDir string) (string, *exec.Cmd, []byte, []byte, error) {
+	args := getHelmfileTemplateArgs(releaseNames, helmfile, debug)
+	cmdline := getCmdline(args)
 	if dryRun {
 		return cmdline, nil, nil, nil, nil
 	}
-	cmd, stdout, stderr, exitCode, err := execCmd(cmdline, path.Dir(helmfile))
+	inputs, ok := getHelmfileInputs(helmfile)
+	if !ok {
+		cacheDir = ""
+	}
+	cmd, stdout, stderr, exitCode, err := execCachedCmd(cacheDir, args, path.Dir(helmfile), inputs)
 	if exitCode != 0 {
 		err = fmt.Errorf("helmfile template failed with exit code %d: %s", exitCode, string(stderr))
 	}
 	return cmdline, cmd, stdout, stderr, err
 }
 
-// getHelmTemplateCmd returns a 'helm template' command line for a Release.
-func getHelmTemplateCmd(releaseName, chart, version, values string, debug bool) string {
-	cmdline := fmt.Sprintf("helm template %s %s --version %s --values %s", releaseName, chart, version, values)
+// getHelmTemplateArgs returns a 'helm template' command and args for a Release.
+func getHelmTemplateArgs(releaseName, chart, version, values string, debug bool) []string {
+	args := []string{"helm", "template", releaseName, chart}
+	if version != "" {
+		args = append(args, "--version", version)
+	}
+	if values != "" {
+		args = append(args, "--values", values)
+	}
 	if debug {
-		cmdline += " --debug"
+		args = append(args, "--debug")
 	}
-	return cmdline
+	return args
 }
 
-// execHelmfileTemplateCmdline executes a 'helm template' command for a Release and returns its command line, command, stdout, stderr and error.
-func execHelmTemplateCmdline(releaseName, chart, version, values string, debug, dryRun bool) (string, *exec.Cmd, []byte, []byte, error) {
-	cmdline := getHelmTemplateCmd(releaseName, chart, version, values, debug)
+// execHelmTemplateCmd executes a 'helm template' command for a Release and returns its command line, command, stdout, stderr and error.
+// The output is cached in cacheDir if not empty, but only for charts pinned to a version in a repository,
+// as local charts aren't fingerprinted and the latest version of a chart changes over time.
+func execHelmTemplateCmd(releaseName, chart, version, values string, debug, dryRun bool, cacheDir string) (string, *exec.Cmd, []byte, []byte, error) {
+	args := getHelmTemplateArgs(releaseName, chart, version, values, debug)
+	cmdline := getCmdline(args)
 	if dryRun {
 		return cmdline, nil, nil, nil, nil
 	}
-	cmd, stdout, stderr, exitCode, err := execCmd(cmdline, "")
+	if version == "" || isLocalChart(chart, "") || (strings.Contains(chart, "://") && !strings.HasPrefix(chart, "oci://")) {
+		cacheDir = ""
+	}
+	inputs := make([]string, 0, 1)
+	if values != "" {
+		inputs = append(inputs, values)
+	}
+	cmd, stdout, stderr, exitCode, err := execCachedCmd(cacheDir, args, "", inputs)
 	if exitCode != 0 {
 		err = fmt.Errorf("helm template failed with exit code %d: %s", exitCode, string(stderr))
 	}
 	return cmdline, cmd, stdout, stderr, err
 }
 
-// getKustomizeBuildCmdline returns a 'kustomize build' command line for a Kustomization source.
-func getKustomizeBuildCmdline(kustomizationSource string) string {
-	return fmt.Sprintf("kustomize build %s", kustomizationSource)
+// getKustomizeBuildArgs returns a 'kustomize build' command and args for a Kustomization source.
+func getKustomizeBuildArgs(kustomizationSource string) []string {
+	return []string{"kustomize", "build", kustomizationSource}
 }
 
 // execKustomizeBuildCmd executes a 'kustomize build' command for a Kustomization and returns its command line, command, stdout, stderr and error.
 func execKustomizeBuildCmd(kustomizationSource string, dryRun bool) (string, *exec.Cmd, []byte, []byte, error) {
-	cmdline := getKustomizeBuildCmdline(kustomizationSource)
+	args := getKustomizeBuildArgs(kustomizationSource)
+	cmdline := getCmdline(args)
 	if dryRun {
 		return cmdline, nil, nil, nil, nil
 	}
-	cmd, stdout, stderr, exitCode, err := execCmd(cmdline, "")
+	// Kustomizations are never cached, as they read resources from anywhere, like '../base' or remote URLs.
+	cmd, stdout, stderr, exitCode, err := execCmd(args, "")
 	if exitCode != 0 {
 		err = fmt.Errorf("kustomize build failed with exit code %d: %s", exitCode, string(stderr))
 	}
@@ -0,0 +1,48 @@
+package core
+
+import (
+	"reflect"
+	"testing"
+)
+
+func TestRender_Docs(t *testing.T) {
+	tests := []struct {
+		name   string
+		stdout string
+		want   []string
+	}{
+		{
+			name:   "should split documents on separators",
+			stdout: "---\n# Source: a.yaml\nkind: A\n---\n# Source: b.yaml\nkind: B\n",
+			want:   []string{"# Source: a.yaml\nkind: A", "# Source: b.yaml\nkind: B"},
+		},
+		{
+			name:   "should not split documents on separators in block scalars",
+			stdout: "kind: ConfigMap\ndata:\n  x.yaml: |\n    ---\n    foo: 1\n---\r\nkind: B\n",
+			want:   []string{"kind: ConfigMap\ndata:\n  x.yaml: |\n    ---\n    foo: 1", "kind: B"},
+		},
+		{
+			name:   "should return single document without separators",
+			stdout: "\nkind: A\n",
+			want:   []string{"kind: A"},
+		},
+		{
+			name:   "should omit empty documents",
+			stdout: "---\n\n---\nkind: A\n---\n",
+			want:   []string{"kind: A"},
+		},
+		{
+			name:   "should return no documents for empty output",
+			stdout: "",
+			want:   []string{},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			r := Render{Stdout: []byte(tt.stdout)}
+			if got := r.Docs(); !reflect.DeepEqual(got, tt.want) {
+				t.Errorf("Docs() = %q, want %q", got, tt.want)
+			}
+		})
+	}
+}
@@ -2,13 +2,47 @@ package core
 
 import (
 	"bytes"
+	"crypto/tls"
 	"errors"
 	"fmt"
 	"io"
+	"net"
 	"net/http"
+	"net/url"
 	"os"
 	"os/exec"
+	"path"
 	"strings"
+	"sync"
+	"time"
+)
+
+// httpClient is the HTTP client shared by all document fetches so that
+// connections to the same host are kept alive and reused across requests.
+// Up to maxConcurrentFetches idle connections are kept per host, so that
+// concurrent fetches of bundle URLs from the same host can all reuse them,
+// and HTTP/2 is used when supported to multiplex them over one connection.
+var httpClient = &http.Client{
+	Timeout:   30 * time.Second,
+	Transport: newHTTPTransport(),
+}
+
+// newHTTPTransport returns the HTTP transport used by httpClient.
+func newHTTPTransport() *http.Transport {
+	transport := http.DefaultTransport.(*http.Transport).Clone()
+	transport.DialContext = (&net.Dialer{Timeout: 5 * time.Second, KeepAlive: 30 * time.Second}).DialContext
+	transport.ForceAttemptHTTP2 = true
+	transport.MaxIdleConns = 2 * maxConcurrentFetches
+	transport.MaxIdleConnsPerHost = maxConcurrentFetches
+	return transport
+}
+
+const (
+	// fetchRetries is the number of times a failed document fetch is retried.
+	fetchRetries = 3
+
+	// fetchBackoff is the delay before the first retry of a failed document fetch, doubled for each retry after.
+	fetchBackoff = 300 * time.Millisecond
 )
 
 // contains tests if a slice contains a given item.
@@ -21,13 +55,128 @@ func contains[T comparable](slice []T, item T) bool {
 	return false
 }
 
+// toSet returns a set of the items in a slice for constant time membership tests.
+func toSet[T comparable](slice []T) map[T]bool {
+	set := make(map[T]bool, len(slice))
+	for _, v := range slice {
+		set[v] = true
+	}
+	return set
+}
+
+// mapConcurrent calls fn for each item with at most limit calls running at once.
+// Results are returned in the same order as items. If any call fails, the error
+// of the first failed item in order is returned.
+func mapConcurrent[T, R any](items []T, limit int, fn func(T) (R, error)) ([]R, error) {
+	if limit < 1 {
+		limit = 1
+	}
+	results := make([]R, len(items))
+	errs := make([]error, len(items))
+	sem := make(chan struct{}, limit)
+	var wg sync.WaitGroup
+	for i, item := range items {
+		wg.Add(1)
+		sem <- struct{}{}
+		go func(i int, item T) {
+			defer wg.Done()
+			defer func() { <-sem }()
+			results[i], errs[i] = fn(item)
+		}(i, item)
+	}
+	wg.Wait()
+	for _, err := range errs {
+		if err != nil {
+			return nil, err
+		}
+	}
+	return results, nil
+}
+
+// onceGroup calls functions at most once per key, sharing their results with all callers of the same key.
+// Concurrent callers of a key wait for the first call to complete. The zero value is ready to use.
+// Results are kept until all callers registered with expect have received them, or for good otherwise.
+type onceGroup[R any] struct {
+	mu    sync.Mutex
+	calls map[string]*onceCall[R]
+}
+
+// onceCall is a call of a function made by a onceGroup, and its results.
+type onceCall[R any] struct {
+	once     sync.Once
+	result   R
+	err      error
+	expected int
+}
+
+// getCall returns the call for key, creating it if needed. The lock must be held.
+func (g *onceGroup[R]) getCall(key string) *onceCall[R] {
+	if g.calls == nil {
+		g.calls = make(map[string]*onceCall[R])
+	}
+	call, ok := g.calls[key]
+	if !ok {
+		call = &onceCall[R]{}
+		g.calls[key] = call
+	}
+	return call
+}
+
+// expect registers an expected caller of do for key. Once all expected callers of a key
+// have received its results, they are forgotten so that they can be garbage collected.
+func (g *onceGroup[R]) expect(key string) {
+	g.mu.Lock()
+	defer g.mu.Unlock()
+	g.getCall(key).expected++
+}
+
+// do calls fn if it has not been called for key before, and returns the results of the call.
+func (g *onceGroup[R]) do(key string, fn func() (R, error)) (R, error) {
+	g.mu.Lock()
+	call := g.getCall(key)
+	g.mu.Unlock()
+	call.once.Do(func() {
+		call.result, call.err = fn()
+	})
+	g.mu.Lock()
+	if call.expected > 0 {
+		call.expected--
+		if call.expected == 0 && g.calls[key] == call {
+			delete(g.calls, key)
+		}
+	}
+	g.mu.Unlock()
+	return call.result, call.err
+}
+
+// lookedUpPaths caches the paths of commands looked up in the PATH by lookPath.
+var lookedUpPaths sync.Map
+
+// lookPathResult is the result of looking up a command in the PATH.
+type lookPathResult struct {
+	path string
+	err  error
+}
+
+// lookPath returns the path of a command found in the PATH like exec.LookPath.
+// Results are cached, as the same few commands are executed many times per run.
+func lookPath(name string) (string, error) {
+	if result, ok := lookedUpPaths.Load(name); ok {
+		return result.(lookPathResult).path, result.(lookPathResult).err
+	}
+	path, err := exec.LookPath(name)
+	lookedUpPaths.Store(name, lookPathResult{path, err})
+	return path, err
+}
+
 // execCmd executes a command and returns its result, including stdout, stderr, exit code, and error when executing the command.
-func execCmd(cmdline, workingDir string) (*exec.Cmd, []byte, []byte, int, error) {
-	// split command name and args out of command line
-	parts := strings.Fields(cmdline)
-	cmdName := parts[0]
-	cmdArgs := parts[1:]
-	cmd := exec.Command(cmdName, cmdArgs...)
+// The command is given as its name followed by its args, which are passed as is without being interpreted by a shell.
+func execCmd(args []string, workingDir string) (*exec.Cmd, []byte, []byte, int, error) {
+	cmdPath, err := lookPath(args[0])
+	if err != nil {
+		return nil, nil, nil, 0, err
+	}
+	cmd := &exec.Cmd{Path: cmdPath, Args: args}
 	if workingDir != "" {
 		cmd.Dir = workingDir
 	}
@@ -35,28 +184,54 @@ func execCmd(cmdline, workingDir string) (*exec.Cmd, []byte, []byte, int, error)
 	var stderr bytes.Buffer
 	cmd.Stdout = &stdout
 	cmd.Stderr = &stderr
-	err := cmd.Run()
+	err = cmd.Run()
 	exitCode := 0
-	if err != nil {
-		var exitErr *exec.ExitError
-		if errors.As(err, &exitErr) {
-			exitCode = exitErr.ExitCode()
-		}
+	// A non-zero exit code is returned rather than an error, but failures to run the command are errors.
+	var exitErr *exec.ExitError
+	if errors.As(err, &exitErr) {
+		exitCode = exitErr.ExitCode()
 		err = nil
 	}
 	return cmd, stdout.Bytes(), stderr.Bytes(), exitCode, err
 }
 
+// getCmdline returns the command line of a command given as its name followed by its args, for display only.
+func getCmdline(args []string) string {
+	return strings.Join(args, " ")
+}
+
 // expandTemplate replaces placeholders in a string with values from a map and returns an error if any placeholders are not expanded.
 func expandTemplate(s string, data map[string]string) (string, error) {
+	return newTemplateExpander(data)(s)
+}
+
+// newTemplateExpander returns a function replacing placeholders in a string with values from a map, returning an error if any
+// placeholders are not expanded. Values are first expanded once against the map, so that they may reference other keys, and
+// strings are then expanded in a single pass with the expanded values, so the result doesn't depend on map iteration order.
+// The expander can be reused for many strings expanded with the same values.
+func newTemplateExpander(data map[string]string) func(string) (string, error) {
+	oldnew := make([]string, 0, 2*len(data))
 	for key, value := range data {
-		placeholder := "{" + key + "}"
-		s = strings.ReplaceAll(s, placeholder, value)
+		oldnew = append(oldnew, "{"+key+"}", value)
+	}
+	valueReplacer := strings.NewReplacer(oldnew...)
+	for i := 1; i < len(oldnew); i += 2 {
+		oldnew[i] = valueReplacer.Replace(oldnew[i])
 	}
-	if strings.Contains(s, "{") && strings.Contains(s, "}") {
-		return s, fmt.Errorf("not all placeholders were expanded")
+	replacer := strings.NewReplacer(oldnew...)
+	return func(s string) (string, error) {
+		s = replacer.Replace(s)
+		if strings.Contains(s, "{") && strings.Contains(s, "}") {
+			return s, fmt.Errorf("not all placeholders were expanded")
+		}
+		return s, nil
 	}
-	return s, nil
+}
+
+// isDocumentSeparator tests if a line of YAML is a document separator. Only unindented separators separate
+// documents, as indented ones are content of block scalars, like multi-document YAML embedded in a ConfigMap.
+func isDocumentSeparator(line string) bool {
+	return strings.TrimRight(line, " \t\r\n") == "---"
 }
 
 // isURL tests if the given string is a URL.
@@ -64,11 +239,47 @@ func isURL(s string) bool {
 	return strings.HasPrefix(s, "https://")
 }
 
+// isLocalChart returns true if a Helm chart reference is a local chart directory or archive rather than
+// a chart in a repository, like 'helm' does, resolving relative paths against dir.
+func isLocalChart(chart, dir string) bool {
+	if strings.Contains(chart, "://") {
+		return false
+	}
+	if strings.HasPrefix(chart, "/") || strings.HasPrefix(chart, "./") || strings.HasPrefix(chart, "../") {
+		return true
+	}
+	_, err := os.Stat(resolvePath(dir, chart))
+	return err == nil
+}
+
+// resolvePath returns a path resolved against dir if relative.
+func resolvePath(dir, p string) string {
+	if path.IsAbs(p) {
+		return p
+	}
+	return path.Join(dir, p)
+}
+
 // fetchDocument makes an HTTP GET request to the given URL and returns the document data and any error encountered.
+// Requests failing with timeouts, connection errors or server errors that may be transient are retried with exponential backoff.
 func fetchDocument(url string) ([]byte, error) {
-	resp, err := http.Get(url)
+	backoff := fetchBackoff
+	for retry := 0; ; retry++ {
+		data, retryable, err := fetchDocumentOnce(url)
+		if err == nil || !retryable || retry == fetchRetries {
+			return data, err
+		}
+		time.Sleep(backoff)
+		backoff *= 2
+	}
+}
+
+// fetchDocumentOnce makes a single HTTP GET request to the given URL and returns the document data,
+// whether the request may succeed if retried, and any error encountered.
+func fetchDocumentOnce(url string) ([]byte, bool, error) {
+	resp, err := httpClient.Get(url)
 	if err != nil {
-		return nil, err
+		return nil, isTransientFetchError(err), err
 	}
 	defer func(Body io.ReadCloser) {
 		if err := Body.Close(); err != nil {
@@ -76,9 +287,29 @@ func fetchDocument(url string) ([]byte, error) {
 		}
 	}(resp.Body)
 	if resp.StatusCode != http.StatusOK {
-		return nil, fmt.Errorf("unexpected status code: %d", resp.StatusCode)
+		retryable := resp.StatusCode == http.StatusTooManyRequests || resp.StatusCode >= http.StatusInternalServerError
+		return nil, retryable, fmt.Errorf("unexpected status code: %d", resp.StatusCode)
+	}
+	data, err := io.ReadAll(resp.Body)
+	return data, err != nil && isTransientFetchError(err), err
+}
+
+// isTransientFetchError returns true if a request failed with a timeout or connection error that may not recur,
+// and false for errors that will, like malformed URLs, unsupported schemes, and TLS handshake or certificate errors.
+func isTransientFetchError(err error) bool {
+	// The client wraps all errors in a *url.Error, which is itself a net.Error, so look at the error it wraps.
+	var urlErr *url.Error
+	if errors.As(err, &urlErr) {
+		err = urlErr.Err
+	}
+	var alertErr tls.AlertError
+	var certErr *tls.CertificateVerificationError
+	var recordErr tls.RecordHeaderError
+	if errors.As(err, &alertErr) || errors.As(err, &certErr) || errors.As(err, &recordErr) {
+		return false
 	}
-	return io.ReadAll(resp.Body)
+	var netErr net.Error
+	return errors.As(err, &netErr) || errors.Is(err, io.EOF) || errors.Is(err, io.ErrUnexpectedEOF)
 }
 
 // readDocument reads the contents of a file at the given path and returns the document data and any error encountered.
@@ -1,6 +1,21 @@
 package core
 
-import "testing"
+import (
+	"crypto/tls"
+	"errors"
+	"fmt"
+	"io"
+	"net"
+	"net/http"
+	"net/http/httptest"
+	"net/url"
+	"os"
+	"path/filepath"
+	"reflect"
+	"sync"
+	"syscall"
+	"testing"
+)
 
 func Test_expandTemplate(t *testing.T) {
 	type args struct {
@@ -46,6 +61,30 @@ func Test_expandTemplate(t *testing.T) {
 			},
 			want: "https://example.com/api/v1.0.0/resource/foo",
 		},
+		{
+			name: "should expand placeholders in values",
+			args: args{
+				s: "{base}/crds.yaml",
+				data: map[string]string{
+					"base":    "https://example.com/{version}",
+					"version": "v1.0.0",
+				},
+			},
+			want: "https://example.com/v1.0.0/crds.yaml",
+		},
+		{
+			name: "should expand placeholders in values only once",
+			args: args{
+				s: "{a}/{b}",
+				data: map[string]string{
+					"a": "{b}",
+					"b": "{c}",
+					"c": "d",
+				},
+			},
+			want:    "{c}/d",
+			wantErr: true,
+		},
 	}
 	for _, tt := range tests {
 		t.Run(tt.name, func(t *testing.T) {
@@ -59,3 +98,351 @@ func Test_expandTemplate(t *testing.T) {
 		})
 	}
 }
+
+func Test_mapConcurrent(t *testing.T) {
+	type args struct {
+		items []int
+		limit int
+	}
+	tests := []struct {
+		name    string
+		args    args
+		want    []int
+		wantErr bool
+	}{
+		{
+			name: "should return results in order",
+			args: args{
+				items: []int{1, 2, 3, 4, 5},
+				limit: 2,
+			},
+			want: []int{2, 4, 6, 8, 10},
+		},
+		{
+			name: "should return error if any item fails",
+			args: args{
+				items: []int{1, -2, 3},
+				limit: 4,
+			},
+			wantErr: true,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			got, err := mapConcurrent(tt.args.items, tt.args.limit, func(i int) (int, error) {
+				if i < 0 {
+					return 0, fmt.Errorf("negative item %d", i)
+				}
+				return i * 2, nil
+			})
+			if (err != nil) != tt.wantErr {
+				t.Errorf("mapConcurrent() error = %v, wantErr %v", err, tt.wantErr)
+				return
+			}
+			if !reflect.DeepEqual(got, tt.want) {
+				t.Errorf("mapConcurrent() got = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func Test_toSet(t *testing.T) {
+	tests := []struct {
+		name  string
+		slice []string
+		want  map[string]bool
+	}{
+		{
+			name:  "should return set of items",
+			slice: []string{"release", "bundle", "release"},
+			want: map[string]bool{
+				"release": true,
+				"bundle":  true,
+			},
+		},
+		{
+			name:  "should return empty set for no items",
+			slice: nil,
+			want:  map[string]bool{},
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := toSet(tt.slice); !reflect.DeepEqual(got, tt.want) {
+				t.Errorf("toSet() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func Test_onceGroup_do(t *testing.T) {
+	tests := []struct {
+		name      string
+		keys      []string
+		wantCalls int
+	}{
+		{
+			name:      "should call once for same key",
+			keys:      []string{"a", "a", "a"},
+			wantCalls: 1,
+		},
+		{
+			name:      "should call once per key",
+			keys:      []string{"a", "b", "a", "c"},
+			wantCalls: 3,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var g onceGroup[string]
+			var mu sync.Mutex
+			calls := 0
+			got, err := mapConcurrent(tt.keys, len(tt.keys), func(key string) (string, error) {
+				return g.do(key, func() (string, error) {
+					mu.Lock()
+					calls++
+					mu.Unlock()
+					return key + "!", nil
+				})
+			})
+			if err != nil {
+				t.Fatalf("do() error = %v", err)
+			}
+			for i, key := range tt.keys {
+				if got[i] != key+"!" {
+					t.Errorf("do() got = %v, want %v", got[i], key+"!")
+				}
+			}
+			if calls != tt.wantCalls {
+				t.Errorf("do() calls = %d, want %d", calls, tt.wantCalls)
+			}
+		})
+	}
+}
+
+func Test_onceGroup_expect(t *testing.T) {
+	tests := []struct {
+		name       string
+		expected   int
+		calls      int
+		wantKept   bool
+		wantCalled int
+	}{
+		{
+			name:       "should keep result until all expected callers are done",
+			expected:   2,
+			calls:      1,
+			wantKept:   true,
+			wantCalled: 1,
+		},
+		{
+			name:       "should forget result once all expected callers are done",
+			expected:   2,
+			calls:      2,
+			wantKept:   false,
+			wantCalled: 1,
+		},
+		{
+			name:       "should keep result without expected callers",
+			expected:   0,
+			calls:      2,
+			wantKept:   true,
+			wantCalled: 1,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var g onceGroup[string]
+			for i := 0; i < tt.expected; i++ {
+				g.expect("a")
+			}
+			called := 0
+			for i := 0; i < tt.calls; i++ {
+				_, _ = g.do("a", func() (string, error) {
+					called++
+					return "a!", nil
+				})
+			}
+			if _, kept := g.calls["a"]; kept != tt.wantKept {
+				t.Errorf("do() kept = %v, want %v", kept, tt.wantKept)
+			}
+			if called != tt.wantCalled {
+				t.Errorf("do() calls = %d, want %d", called, tt.wantCalled)
+			}
+		})
+	}
+}
+
+func Test_fetchDocument(t *testing.T) {
+	tests := []struct {
+		name      string
+		statuses  []int
+		want      string
+		wantErr   bool
+		wantCalls int
+	}{
+		{
+			name:      "should fetch document",
+			statuses:  []int{http.StatusOK},
+			want:      "kind: A",
+			wantCalls: 1,
+		},
+		{
+			name:      "should retry server errors",
+			statuses:  []int{http.StatusBadGateway, http.StatusTooManyRequests, http.StatusOK},
+			want:      "kind: A",
+			wantCalls: 3,
+		},
+		{
+			name:      "should not retry client errors",
+			statuses:  []int{http.StatusNotFound, http.StatusOK},
+			wantErr:   true,
+			wantCalls: 1,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			calls := 0
+			server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+				status := tt.statuses[calls]
+				calls++
+				w.WriteHeader(status)
+				if status == http.StatusOK {
+					_, _ = w.Write([]byte("kind: A"))
+				}
+			}))
+			defer server.Close()
+			got, err := fetchDocument(server.URL)
+			if (err != nil) != tt.wantErr {
+				t.Errorf("fetchDocument() error = %v, wantErr %v", err, tt.wantErr)
+			}
+			if string(got) != tt.want {
+				t.Errorf("fetchDocument() got = %v, want %v", string(got), tt.want)
+			}
+			if calls != tt.wantCalls {
+				t.Errorf("fetchDocument() calls = %d, want %d", calls, tt.wantCalls)
+			}
+		})
+	}
+}
+
+func Test_isTransientFetchError(t *testing.T) {
+	tests := []struct {
+		name string
+		err  error
+		want bool
+	}{
+		{
+			name: "should return true for connection errors",
+			err:  &url.Error{Op: "Get", URL: "https://example.com", Err: &net.OpError{Op: "dial", Err: syscall.ECONNREFUSED}},
+			want: true,
+		},
+		{
+			name: "should return true for connections closed early",
+			err:  &url.Error{Op: "Get", URL: "https://example.com", Err: io.EOF},
+			want: true,
+		},
+		{
+			name: "should return false for certificate errors",
+			err:  &url.Error{Op: "Get", URL: "https://example.com", Err: &tls.CertificateVerificationError{Err: errors.New("x509: certificate signed by unknown authority")}},
+			want: false,
+		},
+		{
+			name: "should return false for TLS alerts",
+			err:  &url.Error{Op: "Get", URL: "https://example.com", Err: &net.OpError{Op: "remote error", Err: tls.AlertError(40)}},
+			want: false,
+		},
+		{
+			name: "should return false for malformed URLs",
+			err:  &url.Error{Op: "parse", URL: "https://exa mple.com", Err: url.InvalidHostError(" ")},
+			want: false,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := isTransientFetchError(tt.err); got != tt.want {
+				t.Errorf("isTransientFetchError() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}
+
+func Test_execCmd(t *testing.T) {
+	tests := []struct {
+		name         string
+		args         []string
+		wantStdout   string
+		wantExitCode int
+		wantErr      bool
+	}{
+		{
+			name:       "should return stdout of command",
+			args:       []string{"sh", "-c", "echo 'hello world'"},
+			wantStdout: "hello world\n",
+		},
+		{
+			name:         "should return exit code of failed command",
+			args:         []string{"sh", "-c", "exit 3"},
+			wantExitCode: 3,
+		},
+		{
+			name:    "should return error if command not found",
+			args:    []string{"manifestus-no-such-command"},
+			wantErr: true,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			_, stdout, _, exitCode, err := execCmd(tt.args, "")
+			if (err != nil) != tt.wantErr {
+				t.Errorf("execCmd() error = %v, wantErr %v", err, tt.wantErr)
+			}
+			if string(stdout) != tt.wantStdout {
+				t.Errorf("execCmd() stdout = %q, want %q", stdout, tt.wantStdout)
+			}
+			if exitCode != tt.wantExitCode {
+				t.Errorf("execCmd() exitCode = %d, want %d", exitCode, tt.wantExitCode)
+			}
+		})
+	}
+}
+
+func Test_isLocalChart(t *testing.T) {
+	dir := t.TempDir()
+	if err := os.Mkdir(filepath.Join(dir, "mychart"), 0755); err != nil {
+		t.Fatal(err)
+	}
+	tests := []struct {
+		name  string
+		chart string
+		want  bool
+	}{
+		{
+			name:  "should return false for repository chart",
+			chart: "jetstack/cert-manager",
+			want:  false,
+		},
+		{
+			name:  "should return false for OCI chart",
+			chart: "oci://registry.example.com/charts/foo",
+			want:  false,
+		},
+		{
+			name:  "should return true for relative path",
+			chart: "./charts/foo",
+			want:  true,
+		},
+		{
+			name:  "should return true for existing chart directory",
+			chart: "mychart",
+			want:  true,
+		},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := isLocalChart(tt.chart, dir); got != tt.want {
+				t.Errorf("isLocalChart() = %v, want %v", got, tt.want)
+			}
+		})
+	}
+}